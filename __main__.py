@@ -1,7 +1,14 @@
 import argparse
 import sys
 
-from notino_scraper import NotinoScraper, set_config_parameters, update_datafile
+from notino_scraper import (
+    NotinoScraper,
+    ProductPrinter,
+    read_product_names,
+    run_worker,
+    set_config_parameters,
+    update_datafile,
+)
 
 
 # TODO: use numpy docstrings convention
@@ -33,27 +40,152 @@ def parse_args() -> argparse.Namespace:
     )
 
     parser.add_argument("--print", action="store_true", help="Prints the product list.")
+    parser.add_argument(
+        "--brand", type=str, default="", help="Only prints the products of this brand."
+    )
+    parser.add_argument(
+        "--name",
+        type=str,
+        default="",
+        help="Only prints the products whose name contains this string.",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        default="",
+        help="Only prints the prices recorded on this date (YYYY-MM-DD) or later.",
+    )
+    parser.add_argument(
+        "--until",
+        type=str,
+        default="",
+        help="Only prints the prices recorded on this date (YYYY-MM-DD) or before.",
+    )
+    parser.add_argument(
+        "--summary",
+        type=str,
+        default="",
+        choices=("",) + ProductPrinter.SUMMARIES,
+        help="Only prints the last, min or max price of each volume.",
+    )
+    parser.add_argument(
+        "--table", action="store_true", help="Prints the prices as a table."
+    )
 
     parser.add_argument(
         "--snapshot",
         action="store_true",
         help="Snapshots the prices of the products recorded.",
     )
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=1,
+        help="Number of product pages loaded at the same time in the tabs of the browser during a snapshot.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Adapts the number of pages loaded at once (up to --tabs or --workers) to the site.",
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        default="",
+        help="Path to a SQLite job queue shared with workers, the snapshot is then taken by the workers.",
+    )
+    parser.add_argument(
+        "--local_workers",
+        type=int,
+        default=0,
+        help="Number of worker processes started on this node when taking a snapshot through a job queue.",
+    )
+    parser.add_argument(
+        "--worker",
+        type=str,
+        default="",
+        help="Runs a worker that processes the jobs of the SQLite job queue passed.",
+    )
+    parser.add_argument(
+        "--visibility_timeout",
+        type=float,
+        default=300.0,
+        help="Duration in seconds after which a job leased by a worker is handed to another one.",
+    )
+    parser.add_argument(
+        "--export",
+        type=str,
+        default="",
+        help="Exports the prices to the file passed (csv, parquet, arrow or feather).",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=65536,
+        help="Number of rows written at once when exporting.",
+    )
     parser.add_argument(
         "--plot", action="store_true", help="Plots the evolution of the prices."
     )
+    parser.add_argument(
+        "--best_deals",
+        action="store_true",
+        help="Prints the products with the lowest price per mL.",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of products printed with --best_deals.",
+    )
+    parser.add_argument(
+        "--dashboard",
+        type=str,
+        default="",
+        help="Writes an HTML report with an interactive chart per product to the file passed.",
+    )
+    parser.add_argument(
+        "--dashboard_points",
+        type=int,
+        default=300,
+        help="Number of points each series is downsampled to in the HTML report.",
+    )
     parser.add_argument(
         "--add_products",
         type=str,
         default="",
         help="Adds the semicolon-separated names of products passed to the list of products.",
     )
+    parser.add_argument(
+        "--add_products_file",
+        type=str,
+        default="",
+        help="Adds the products whose names are listed in the file passed, one name per line.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Number of browsers used concurrently to look for the products to add.",
+    )
     parser.add_argument(
         "--get_prices",
         type=str,
         default="",
         help="Fetches the prices for the semicolon-separated names of products passed.",
     )
+    parser.add_argument(
+        "--crawl",
+        type=str,
+        default="",
+        help="Records the prices displayed on the semicolon-separated urls of listing pages.",
+    )
+    parser.add_argument(
+        "--max_pages",
+        type=int,
+        default=50,
+        help="Maximum number of pages walked per listing when crawling.",
+    )
 
     return parser.parse_args()
 
@@ -68,20 +200,54 @@ if __name__ == "__main__":
     if args.config:
         set_config_parameters()
         exit(0)
+    if args.worker != "":
+        run_worker(
+            args.worker,
+            visibility_timeout=args.visibility_timeout,
+            idle_timeout=None,
+            verbose=args.verbose,
+        )
+        exit(0)
 
-    # This instantiation takes some time.
+    # The browser is only launched when a command needs it.
     notino_scraper = NotinoScraper(args.verbose, args.debug)
 
     if args.print:
-        print(notino_scraper.product_list)
+        notino_scraper.print_products(
+            ProductPrinter(
+                brand=args.brand,
+                name=args.name,
+                since=args.since,
+                until=args.until,
+                summary=args.summary,
+                table=args.table,
+            )
+        )
     if args.snapshot:
-        notino_scraper.take_snapshot()
+        notino_scraper.take_snapshot(
+            args.queue,
+            args.local_workers,
+            args.visibility_timeout,
+            tabs=args.tabs,
+            adaptive=args.adaptive,
+        )
+    if args.crawl != "":
+        notino_scraper.crawl_catalogue(args.crawl.split(";"), args.max_pages)
+    if args.best_deals:
+        notino_scraper.print_best_deals(args.top)
+    if args.dashboard != "":
+        notino_scraper.build_dashboard(args.dashboard, args.dashboard_points)
+    if args.export != "":
+        notino_scraper.export(args.export, args.batch_size)
     if args.plot:
         notino_scraper.plot_evolution()
-    for product_name in args.add_products.split(";"):
-        notino_scraper.add_product(product_name)
+    product_names = args.add_products.split(";")
+    if args.add_products_file != "":
+        product_names += read_product_names(args.add_products_file)
+    notino_scraper.add_products(product_names, args.workers, args.adaptive)
     for search_name in args.get_prices.split("; "):
         notino_scraper.get_price(search_name)
 
     if args.verbose:
+        notino_scraper.print_search_cache_statistics()
         print("Execution successfully ended.")
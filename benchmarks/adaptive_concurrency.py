@@ -0,0 +1,142 @@
+"""
+Runs the adaptive concurrency controller against a local stub server that injects latency and errors.
+
+The stub server handles `capacity` requests at a time at full speed: every request beyond that adds latency, and past
+twice the capacity requests are answered with 429 Too Many Requests. Halfway through the run the capacity drops, as it
+would at peak hours, and the controller is expected to back off then settle around the new capacity.
+
+Usage: python benchmarks/adaptive_concurrency.py [--duration 20] [--capacity 6] [--max_limit 16]
+"""
+import argparse
+import os
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from notino_scraper.data_structures import BlockedPageException  # noqa: E402
+from notino_scraper.scraper import AdaptiveConcurrencyController  # noqa: E402
+
+
+class StubState:
+    def __init__(self, capacity: int, base_latency: float, error_rate: float) -> None:
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.error_rate = error_rate
+        self.active = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(state: StubState):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            with state.lock:
+                state.active += 1
+                active, capacity = state.active, state.capacity
+            try:
+                if active > 2 * capacity:
+                    self.send_response(429)
+                    body = b"<title>Too Many Requests</title>"
+                elif random.random() < state.error_rate:
+                    self.send_response(503)
+                    body = b"<title>Service Unavailable</title>"
+                else:
+                    overload = max(0, active - capacity)
+                    time.sleep(
+                        state.base_latency * (1 + overload) * random.uniform(0.8, 1.2)
+                    )
+                    self.send_response(200)
+                    body = b"<title>Product</title>"
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with state.lock:
+                    state.active -= 1
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return StubHandler
+
+
+def fetch(url: str, timeout: float) -> None:
+    """
+    Sends a request and turns the answers of an overloaded server into the exceptions the controller classifies.
+    """
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+    except urllib.error.HTTPError as error:
+        if error.code == 429:
+            raise BlockedPageException(url)
+        raise
+    except urllib.error.URLError as error:
+        if isinstance(error.reason, socket.timeout):
+            raise TimeoutError(url)
+        raise
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--capacity", type=int, default=6)
+    parser.add_argument("--max_limit", type=int, default=16)
+    parser.add_argument("--base_latency", type=float, default=0.05)
+    parser.add_argument("--error_rate", type=float, default=0.01)
+    parser.add_argument("--timeout", type=float, default=1.0)
+    args = parser.parse_args()
+
+    state = StubState(args.capacity, args.base_latency, args.error_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/product"
+
+    controller = AdaptiveConcurrencyController(
+        min_limit=1,
+        max_limit=args.max_limit,
+        window=20,
+        latency_target=2 * args.base_latency,
+    )
+    deadline = time.monotonic() + args.duration
+    counts = {"ok": 0, "failed": 0}
+    counts_lock = threading.Lock()
+
+    def client() -> None:
+        while time.monotonic() < deadline:
+            try:
+                with controller.slot():
+                    fetch(url, args.timeout)
+                key = "ok"
+            except Exception:
+                key = "failed"
+            with counts_lock:
+                counts[key] += 1
+
+    def peak_hours() -> None:
+        time.sleep(args.duration / 2)
+        state.capacity = max(1, args.capacity // 3)
+        print(f"--- Stub server capacity dropped to {state.capacity} ---")
+
+    threads = [threading.Thread(target=client) for _ in range(args.max_limit)]
+    threading.Thread(target=peak_hours, daemon=True).start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    server.shutdown()
+
+    print(
+        f"{counts['ok']} requests succeeded and {counts['failed']} failed in {args.duration:.0f} s "
+        f"({counts['ok'] / args.duration:.1f} successful requests/s), final limit {controller.current_limit}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Runs a distributed snapshot with several worker processes sharing a job queue, using a fake scraper instead of a browser.
+
+One extra worker dies right after leasing a job, the job has to be handed to another worker once its lease expires, and
+the first browser launched by another worker fails to start. The other workers are expected to stay alive until every
+job of the run is finished, then to stop on their own. Half of the products were already snapshotted: their page is
+opened from its url and, its fingerprint being unchanged, their prices are not extracted again.
+
+Usage: python benchmarks/distributed_snapshot.py [--jobs 200] [--workers 4] [--latency 0.02] [--visibility_timeout 2]
+"""
+import argparse
+import datetime
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from notino_scraper.data_structures import (  # noqa: E402
+    Product,
+    ProductNotFoundException,
+    ProductPrice,
+)
+from notino_scraper.distributed import JobQueue, run_worker  # noqa: E402
+
+NOT_FOUND_EVERY = 17
+"""
+One product out of NOT_FOUND_EVERY is not found by the fake scraper.
+"""
+
+
+class FakeScraper:
+    """
+    Mimics Scraper.snapshot_product: the search is only needed without a url, and the prices are only extracted if the
+    fingerprint of the page changed, extracting them taking as long as loading the page.
+    """
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    def snapshot_product(self, product: Product) -> List[ProductPrice]:
+        time.sleep(self.latency)
+        index = int(product.product_name.split()[-1])
+        if product.url == "":
+            if index % NOT_FOUND_EVERY == 0:
+                raise ProductNotFoundException(product.get_search_name())
+            time.sleep(self.latency)
+            product.url = page_url(index)
+
+        today = datetime.date.today().isoformat()
+        if product.fingerprint == page_fingerprint(index):
+            if len(prices := product.get_fingerprint_prices(today)) > 0:
+                return prices
+        time.sleep(self.latency)
+        prices = [ProductPrice(price=float(index % 100), volume=50, date=today)]
+        product.set_fingerprint(page_fingerprint(index), prices)
+        return prices
+
+
+def page_url(index: int) -> str:
+    return f"https://www.notino.fr/product-{index}/"
+
+
+def page_fingerprint(index: int) -> str:
+    return f"fingerprint-{index}"
+
+
+def make_products(n_products: int) -> List[Product]:
+    """
+    Creates the products to snapshot, the ones with an even index having already been snapshotted.
+    """
+    products = []
+    for index in range(n_products):
+        product = Product(
+            {
+                "product_name": f"Product {index}",
+                "description": "Eau de Parfum",
+                "brand": "Brand",
+                "prices": [],
+            }
+        )
+        if index % 2 == 0 and index % NOT_FOUND_EVERY != 0:
+            product.url = page_url(index)
+            product.set_fingerprint(
+                page_fingerprint(index),
+                [ProductPrice(price=float(index % 100), volume=50)],
+            )
+        products.append(product)
+    return products
+
+
+class FakeScraperFactory:
+    """
+    Launches fake scrapers, the first n_failures launches failing as a browser that does not start would.
+    """
+
+    def __init__(self, latency: float, n_failures: int = 0) -> None:
+        self.latency = latency
+        self.n_failures = n_failures
+
+    def __call__(self) -> FakeScraper:
+        if self.n_failures > 0:
+            self.n_failures -= 1
+            raise RuntimeError("Browser failed to start.")
+        return FakeScraper(self.latency)
+
+
+def crashing_worker(queue_file: str, visibility_timeout: float) -> None:
+    """
+    Leases a job and dies without reporting back.
+    """
+    JobQueue(queue_file).lease("crashing-worker", visibility_timeout)
+    os._exit(1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--visibility_timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        queue_file = os.path.join(folder, "queue.sqlite")
+        queue = JobQueue(queue_file)
+        run_id = uuid.uuid4().hex
+        products = make_products(args.jobs)
+        queue.enqueue(run_id, list(enumerate(products)))
+
+        start = time.perf_counter()
+        crashing = multiprocessing.Process(
+            target=crashing_worker, args=(queue_file, args.visibility_timeout)
+        )
+        crashing.start()
+        crashing.join()
+        workers = [
+            multiprocessing.Process(
+                target=run_worker,
+                args=(queue_file,),
+                kwargs={
+                    "worker": f"worker-{index}",
+                    "run_id": run_id,
+                    "visibility_timeout": args.visibility_timeout,
+                    "idle_timeout": None,
+                    "poll_interval": 0.05,
+                    "scraper_factory": FakeScraperFactory(
+                        args.latency, n_failures=1 if index == 0 else 0
+                    ),
+                    "verbose": False,
+                },
+            )
+            for index in range(args.workers)
+        ]
+        for worker in workers:
+            worker.start()
+
+        while queue.count_unfinished(run_id) > 0:
+            time.sleep(0.1)
+            queue.requeue_expired()
+        elapsed = time.perf_counter() - start
+        for worker in workers:
+            worker.join(timeout=10)
+        assert not any(
+            worker.is_alive() for worker in workers
+        ), "The workers did not stop once the run was finished."
+        assert all(
+            worker.exitcode == 0 for worker in workers
+        ), "A worker did not exit cleanly."
+
+        results = list(queue.results(run_id))
+        assert sorted(job.product_key for job, _, _ in results) == list(
+            range(args.jobs)
+        ), "Some jobs were lost or processed twice."
+        n_not_found = sum(
+            error is not None and error.startswith("Product not found")
+            for _, _, error in results
+        )
+        n_failed = sum(prices is None for _, prices, _ in results)
+        assert n_not_found == len(
+            range(0, args.jobs, NOT_FOUND_EVERY)
+        ), "Unexpected number of products not found."
+        n_retried = sum(job.attempts > 1 for job, _, _ in results)
+        n_hits = 0
+        for job, prices, _ in results:
+            if prices is not None:
+                handed_back = (job.product["url"], job.product["fingerprint"])
+                assert handed_back == (
+                    page_url(job.product_key),
+                    page_fingerprint(job.product_key),
+                ), "The url and the fingerprint were not handed back."
+                n_hits += products[job.product_key].fingerprint != ""
+        print(
+            f"{args.jobs} jobs, {args.workers} workers, {args.latency * 1000:.0f} ms per job: "
+            f"{elapsed:.2f} s ({args.jobs / elapsed:.1f} jobs/s)"
+        )
+        print(
+            f"{args.jobs - n_failed} prices found, {n_not_found} products not found, "
+            f"{n_failed - n_not_found} jobs failed, {n_retried} jobs retried, "
+            f"{n_hits} unchanged pages."
+        )
+        queue.purge(run_id)
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compares the plain and the run-length encoded json formats on a synthetic multi-year price history.
+
+Usage: python benchmarks/price_series_storage.py [--products 200] [--years 3]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), ".."))
+
+from notino_scraper.data_structures import ProductList  # noqa: E402
+
+
+def generate_products(n_products: int, n_years: int, seed: int = 0) -> list:
+    """
+    Generates daily prices for a few volumes per product, with occasional price changes and missed snapshots.
+    """
+    rng = random.Random(seed)
+    first_day = date(2022, 1, 1)
+    products = []
+    for index in range(n_products):
+        prices = []
+        volumes = {
+            f"{volume} ml": rng.uniform(20, 150)
+            for volume in rng.sample([30, 50, 75, 100, 125, 200], 3)
+        }
+        for day in range(365 * n_years):
+            if rng.random() < 0.05:
+                continue
+            for volume in volumes:
+                if rng.random() < 0.03:
+                    volumes[volume] = rng.uniform(20, 150)
+                prices.append(
+                    {
+                        "price": f"{volumes[volume]:.2f}".replace(".", ","),
+                        "volume": volume,
+                        "date": (first_day + timedelta(days=day)).isoformat(),
+                    }
+                )
+        products.append(
+            {
+                "product_name": f"Product {index}",
+                "description": "Eau de Parfum",
+                "brand": f"Brand {index % 20}",
+                "prices": prices,
+            }
+        )
+    return products
+
+
+def time_load(filename: str, decode: bool) -> float:
+    start = time.perf_counter()
+    product_list = ProductList(filename)
+    if decode:
+        for product in product_list.products:
+            len(product.prices)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--years", type=int, default=3)
+    args = parser.parse_args()
+
+    products = generate_products(args.products, args.years)
+    with tempfile.TemporaryDirectory() as folder:
+        plain_file, encoded_file = os.path.join(folder, "plain.json"), os.path.join(
+            folder, "encoded.json"
+        )
+        with open(plain_file, "w") as json_file:
+            json.dump(products, json_file)
+        with open(encoded_file, "w") as json_file:
+            json.dump(products, json_file)
+        ProductList(encoded_file).save()
+
+        # the records are normalised when read, e.g. "125 ml" becomes 125 and "26,00" becomes 26.0
+        normalized = [product.prices for product in ProductList(plain_file).products]
+        decoded = [product.prices for product in ProductList(encoded_file).products]
+        assert decoded == normalized, "The encoding is not lossless."
+
+        n_records = sum(len(product["prices"]) for product in products)
+        print(
+            f"{args.products} products, {args.years} years, {n_records} price records"
+        )
+        for name, filename in (("plain", plain_file), ("encoded", encoded_file)):
+            print(
+                f"{name:>8}: {os.path.getsize(filename) / 1e6:8.2f} MB, "
+                f"load {time_load(filename, decode=False):6.3f} s, "
+                f"load and decode {time_load(filename, decode=True):6.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
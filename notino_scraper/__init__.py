@@ -1,2 +1,5 @@
 from .notino import NotinoScraper
+from .printer import ProductPrinter
 from .config_handler import set_config_parameters, update_datafile
+from .distributed import run_worker
+from .registration import read_product_names
@@ -0,0 +1,283 @@
+import datetime
+import html
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .data_structures import Product, ProductList, ProductPrice
+
+CONCENTRATIONS = (
+    "extrait de parfum",
+    "eau de parfum",
+    "eau de toilette",
+    "eau de cologne",
+    "eau fraîche",
+    "parfum",
+)
+
+
+def get_category(description: str) -> str:
+    """
+    Finds the category of a product, i.e. its concentration, from its description (e.g. "Eau de Parfum pour homme").
+
+    Args:
+        description: The description of the product.
+
+    Returns:
+        The concentration if it is mentioned, the whole description otherwise.
+    """
+    description = html.unescape(description).lower()
+    return next(
+        (
+            concentration
+            for concentration in CONCENTRATIONS
+            if concentration in description
+        ),
+        description.strip(),
+    )
+
+
+@dataclass
+class DealEntry:
+    product: str
+    brand: str
+    category: str
+    volume_ml: int
+    last_date: str
+    last_price: float
+    last_price_per_ml: float
+    min_price_per_ml: float
+    min_date: str
+    n_prices: int
+
+    @property
+    def distance_from_min(self) -> float:
+        """
+        How much more expensive the last price is than the lowest price recorded, 0 meaning it is the lowest.
+        """
+        if self.min_price_per_ml == 0:
+            # a product that was once free, e.g. a price misread as 0
+            return 0.0 if self.last_price_per_ml == 0 else float("inf")
+        return self.last_price_per_ml / self.min_price_per_ml - 1
+
+
+def _series_key(product: Product, volume_ml: int) -> str:
+    return json.dumps(
+        [product.brand, product.product_name, product.description, volume_ml]
+    )
+
+
+def price_per_ml_table(
+    product_list: ProductList,
+) -> Tuple[List[Tuple[Product, int]], Dict[str, np.ndarray]]:
+    """
+    Computes the price per mL of every (product, volume) on every date in one vectorised pass.
+    The prices of unavailable products and of unknown volumes are left out.
+
+    Args:
+        product_list: The products to look into.
+
+    Returns:
+        The (product, volume) of each series and the columns "series", "date" (ordinal), "price" and "price_per_ml",
+        sorted by series then date.
+    """
+    series_list: List[Tuple[Product, int]] = []
+    ids, dates, prices, volumes = [], [], [], []
+    for product in product_list.get_products():
+        for series in product.series.values():
+            if (volume_ml := series.volume) <= 0:
+                continue
+            series_id = len(series_list)
+            series_list.append((product, volume_ml))
+            for run in series.runs:
+                if (price := run["price"]) is None:
+                    continue
+                for _, price_date in series.items_of_run(run):
+                    ids.append(series_id)
+                    dates.append(datetime.date.fromisoformat(price_date).toordinal())
+                    prices.append(price)
+                    volumes.append(volume_ml)
+
+    columns = {
+        "series": np.asarray(ids, dtype=np.int64),
+        "date": np.asarray(dates, dtype=np.int64),
+        "price": np.asarray(prices, dtype=np.float64),
+    }
+    columns["price_per_ml"] = columns["price"] / np.asarray(volumes, dtype=np.float64)
+    order = np.lexsort((columns["date"], columns["series"]))
+    return series_list, {name: column[order] for name, column in columns.items()}
+
+
+class BestDealIndex:
+    """
+    Latest and lowest price per mL of every (product, volume), stored next to the json file.
+    It is built from the whole history once, then updated with the prices of each snapshot.
+    """
+
+    def __init__(self, filename: str, entries: Dict[str, DealEntry]) -> None:
+        self.filename = filename
+        self.entries = entries
+
+    @staticmethod
+    def get_filename(datafile: str) -> str:
+        return f"{os.path.splitext(datafile)[0]}.deals.json"
+
+    @classmethod
+    def build(cls, filename: str, product_list: ProductList) -> "BestDealIndex":
+        """
+        Builds the index from the whole history of prices.
+
+        Args:
+            filename: The path of the json file that stores the index.
+            product_list: The products to index.
+
+        Returns:
+            The index.
+        """
+        series_list, table = price_per_ml_table(product_list)
+        entries: Dict[str, DealEntry] = {}
+        if len(table["series"]) > 0:
+            starts = np.flatnonzero(
+                np.r_[True, table["series"][1:] != table["series"][:-1]]
+            )
+            ends = np.r_[starts[1:], len(table["series"])] - 1
+            # the rows of each series are sorted by price per mL then date: the first one is the lowest and oldest
+            by_price = np.lexsort(
+                (table["date"], table["price_per_ml"], table["series"])
+            )[starts]
+            for start, last, lowest in zip(starts, ends, by_price):
+                product, volume_ml = series_list[table["series"][start]]
+                entries[_series_key(product, volume_ml)] = DealEntry(
+                    product=html.unescape(product.product_name),
+                    brand=html.unescape(product.brand),
+                    category=get_category(product.description),
+                    volume_ml=volume_ml,
+                    last_date=datetime.date.fromordinal(
+                        int(table["date"][last])
+                    ).isoformat(),
+                    last_price=float(table["price"][last]),
+                    last_price_per_ml=float(table["price_per_ml"][last]),
+                    min_price_per_ml=float(table["price_per_ml"][lowest]),
+                    min_date=datetime.date.fromordinal(
+                        int(table["date"][lowest])
+                    ).isoformat(),
+                    n_prices=int(last - start + 1),
+                )
+        return cls(filename, entries)
+
+    @classmethod
+    def load_or_build(cls, datafile: str, product_list: ProductList) -> "BestDealIndex":
+        """
+        Loads the index of a json file. It is built again and saved if it is missing or older than the json file.
+
+        Args:
+            datafile: The path of the json file that stores the products.
+            product_list: The products read from this file.
+
+        Returns:
+            The index.
+        """
+        filename = cls.get_filename(datafile)
+        if os.path.isfile(filename) and os.path.getmtime(filename) >= os.path.getmtime(
+            datafile
+        ):
+            with open(filename) as json_file:
+                return cls(
+                    filename,
+                    {
+                        key: DealEntry(**entry)
+                        for key, entry in json.load(json_file).items()
+                    },
+                )
+        deal_index = cls.build(filename, product_list)
+        deal_index.save()
+        return deal_index
+
+    def save(self) -> None:
+        with open(self.filename, "w") as json_file:
+            json.dump(
+                {key: asdict(entry) for key, entry in self.entries.items()}, json_file
+            )
+
+    def update(self, product: Product, prices: List[ProductPrice]) -> None:
+        """
+        Updates the index with the prices just recorded for a product.
+
+        Args:
+            product: The product.
+            prices: The prices actually stored by Product.add_prices, the duplicates it drops are not counted.
+        """
+        for product_price in prices:
+            volume_ml, price = product_price.volume, product_price.price
+            if volume_ml <= 0 or price is None:
+                continue
+            price_per_ml = price / volume_ml
+            if (
+                entry := self.entries.get(key := _series_key(product, volume_ml))
+            ) is None:
+                self.entries[key] = DealEntry(
+                    product=html.unescape(product.product_name),
+                    brand=html.unescape(product.brand),
+                    category=get_category(product.description),
+                    volume_ml=volume_ml,
+                    last_date=product_price.date,
+                    last_price=price,
+                    last_price_per_ml=price_per_ml,
+                    min_price_per_ml=price_per_ml,
+                    min_date=product_price.date,
+                    n_prices=1,
+                )
+                continue
+            if product_price.date >= entry.last_date:
+                entry.last_date, entry.last_price, entry.last_price_per_ml = (
+                    product_price.date,
+                    price,
+                    price_per_ml,
+                )
+            if price_per_ml < entry.min_price_per_ml:
+                entry.min_price_per_ml, entry.min_date = (
+                    price_per_ml,
+                    product_price.date,
+                )
+            entry.n_prices += 1
+
+    def top(self, n: int) -> List[Tuple[DealEntry, int, int]]:
+        """
+        Finds the cheapest (product, volume) per mL as of their latest price.
+        Only the volumes found in the latest snapshot of their product are ranked, the ones that are no longer listed
+        keep a last price that is not current anymore.
+
+        Args:
+            n: The number of entries to return.
+
+        Returns:
+            The entries sorted by price per mL, along with their rank within their brand and within their category.
+        """
+        # the keys list the brand, name, description and volume, the first three identifying the product
+        latest_dates: Dict[str, str] = {}
+        for key, entry in self.entries.items():
+            product_key = json.dumps(json.loads(key)[:3])
+            latest_dates[product_key] = max(
+                latest_dates.get(product_key, ""), entry.last_date
+            )
+        entries = sorted(
+            (
+                entry
+                for key, entry in self.entries.items()
+                if entry.last_date == latest_dates[json.dumps(json.loads(key)[:3])]
+            ),
+            key=lambda entry: entry.last_price_per_ml,
+        )
+        brand_ranks: Dict[str, int] = {}
+        category_ranks: Dict[str, int] = {}
+        ranked = []
+        for entry in entries:
+            brand_ranks[entry.brand] = brand_ranks.get(entry.brand, 0) + 1
+            category_ranks[entry.category] = category_ranks.get(entry.category, 0) + 1
+            ranked.append(
+                (entry, brand_ranks[entry.brand], category_ranks[entry.category])
+            )
+        return ranked[:n]
@@ -0,0 +1,361 @@
+import base64
+import datetime
+import html
+import json
+import sys
+from array import array
+from typing import Any, Dict, List, Sequence
+
+from .data_structures import ProductList
+
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], n_points: int) -> List[int]:
+    """
+    Downsamples a series with the Largest-Triangle-Three-Buckets algorithm, which keeps its visual shape
+    (peaks and drops included) far better than taking every n-th point.
+
+    Args:
+        xs: The abscissas of the series, in increasing order.
+        ys: The ordinates of the series.
+        n_points: The number of points to keep, at least 3.
+
+    Returns:
+        The indices of the points kept, the first and the last ones included.
+    """
+    n = len(xs)
+    if n <= n_points or n_points < 3:
+        return list(range(n))
+
+    indices = [0]
+    bucket_size = (n - 2) / (n_points - 2)
+    selected = 0
+    for bucket in range(n_points - 2):
+        start, end = int(bucket * bucket_size) + 1, int((bucket + 1) * bucket_size) + 1
+        # average point of the next bucket, which is the last point alone for the last bucket
+        next_start, next_end = end, min(int((bucket + 2) * bucket_size) + 1, n)
+        average_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        average_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        best_area, best_index = -1.0, start
+        for index in range(start, end):
+            area = abs(
+                (xs[selected] - average_x) * (ys[index] - ys[selected])
+                - (xs[selected] - xs[index]) * (average_y - ys[selected])
+            )
+            if area > best_area:
+                best_area, best_index = area, index
+        indices.append(best_index)
+        selected = best_index
+    indices.append(n - 1)
+    return indices
+
+
+def build_payload(product_list: ProductList, n_points: int) -> Dict[str, Any]:
+    """
+    Lays the series out in a columnar binary blob: the dates of every point as int32 days since 1970-01-01,
+    followed by the prices as float32. Each series holds its full-resolution points and a downsampled overview.
+
+    Args:
+        product_list: The products to display.
+        n_points: The number of points of each overview.
+
+    Returns:
+        The description of the charts and the blob encoded in base64.
+    """
+    dates, prices = array("i"), array("f")
+    charts = []
+    for product in product_list.get_products():
+        chart_series = []
+        for series in product.series.values():
+            points = sorted(
+                (
+                    datetime.date.fromisoformat(price_date).toordinal() - EPOCH_ORDINAL,
+                    price,
+                )
+                for price, price_date in series.items()
+                if price is not None
+            )
+            if len(points) == 0:
+                continue
+            xs, ys = [point[0] for point in points], [point[1] for point in points]
+            full_offset = len(dates)
+            dates.extend(xs)
+            prices.extend(ys)
+            overview_offset = len(dates)
+            overview = lttb(xs, ys, n_points)
+            dates.extend(xs[index] for index in overview)
+            prices.extend(ys[index] for index in overview)
+            chart_series.append(
+                {
+                    "volume": series.volume,
+                    "full": [full_offset, len(xs)],
+                    "overview": [overview_offset, len(overview)],
+                }
+            )
+        if chart_series:
+            charts.append(
+                {
+                    "title": html.unescape(
+                        f"{product.brand} {product.product_name} ({product.description})"
+                    ),
+                    "series": chart_series,
+                }
+            )
+
+    # typed arrays in the browser use the little-endian byte order
+    if sys.byteorder == "big":
+        dates.byteswap()
+        prices.byteswap()
+    return {
+        "charts": charts,
+        "n_points": len(dates),
+        "blob": base64.b64encode(dates.tobytes() + prices.tobytes()).decode("ascii"),
+    }
+
+
+def write_dashboard(
+    product_list: ProductList, filename: str, n_points: int = 300
+) -> int:
+    """
+    Writes a self-contained HTML report with one interactive chart per product.
+    The charts display the downsampled overviews and switch to the full-resolution points when zooming in.
+
+    Args:
+        product_list: The products to display.
+        filename: The path of the HTML file to write.
+        n_points: The number of points of each overview.
+
+    Returns:
+        The number of charts written.
+    """
+    payload = build_payload(product_list, n_points)
+    with open(filename, "w", encoding="utf-8") as html_file:
+        html_file.write(
+            DASHBOARD_TEMPLATE.replace(
+                "/*CHARTS*/", json.dumps(payload["charts"]).replace("</", "<\\/")
+            )
+            .replace("/*N_POINTS*/", str(payload["n_points"]))
+            .replace("/*BLOB*/", payload["blob"])
+        )
+    return len(payload["charts"])
+
+
+DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Notino prices</title>
+<style>
+  body { font-family: sans-serif; margin: 1em 2em; background: #fafafa; }
+  #filter { width: 30em; padding: .3em; margin-bottom: 1em; }
+  .chart { background: white; border: 1px solid #ddd; margin-bottom: 1em; padding: .5em; }
+  .chart h3 { font-size: 1em; margin: 0 0 .3em 0; }
+  .chart canvas { width: 100%; height: 240px; cursor: crosshair; }
+  .legend span { margin-right: 1em; font-size: .85em; }
+  .hover { font-size: .85em; color: #555; min-height: 1.2em; }
+</style>
+</head>
+<body>
+<h1>Notino prices</h1>
+<p>Drag over a chart to zoom in, double-click to zoom out.</p>
+<input id="filter" placeholder="Filter products">
+<div id="charts"></div>
+<script id="blob" type="application/octet-stream">/*BLOB*/</script>
+<script>
+const CHARTS = /*CHARTS*/;
+const N_POINTS = /*N_POINTS*/;
+const COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2", "#17becf"];
+const DAY_MS = 86400000;
+
+const bytes = Uint8Array.from(atob(document.getElementById("blob").textContent), c => c.charCodeAt(0));
+const DATES = new Int32Array(bytes.buffer, 0, N_POINTS);
+const PRICES = new Float32Array(bytes.buffer, 4 * N_POINTS, N_POINTS);
+
+function lttb(xs, ys, n) {
+  if (xs.length <= n || n < 3) return xs.map((_, i) => i);
+  const indices = [0], size = (xs.length - 2) / (n - 2);
+  let selected = 0;
+  for (let bucket = 0; bucket < n - 2; bucket++) {
+    const start = Math.floor(bucket * size) + 1, end = Math.floor((bucket + 1) * size) + 1;
+    const nextStart = end, nextEnd = Math.min(Math.floor((bucket + 2) * size) + 1, xs.length);
+    let ax = 0, ay = 0;
+    for (let i = nextStart; i < nextEnd; i++) { ax += xs[i]; ay += ys[i]; }
+    ax /= nextEnd - nextStart; ay /= nextEnd - nextStart;
+    let best = -1, bestIndex = start;
+    for (let i = start; i < end; i++) {
+      const area = Math.abs(
+        (xs[selected] - ax) * (ys[i] - ys[selected]) - (xs[selected] - xs[i]) * (ay - ys[selected])
+      );
+      if (area > best) { best = area; bestIndex = i; }
+    }
+    indices.push(bestIndex);
+    selected = bestIndex;
+  }
+  indices.push(xs.length - 1);
+  return indices;
+}
+
+function slice([offset, length]) {
+  return [DATES.subarray(offset, offset + length), PRICES.subarray(offset, offset + length)];
+}
+
+function formatDay(day) {
+  return new Date(day * DAY_MS).toISOString().slice(0, 10);
+}
+
+class Chart {
+  constructor(chart, container) {
+    this.chart = chart;
+    this.zoom = null;
+    const element = document.createElement("div");
+    element.className = "chart";
+    element.innerHTML = "<h3></h3><canvas></canvas><div class='hover'></div><div class='legend'></div>";
+    element.querySelector("h3").textContent = chart.title;
+    element.querySelector(".legend").innerHTML = chart.series
+      .map((series, i) => {
+        const color = COLORS[i % COLORS.length];
+        return `<span style="color:${color}">&#9632; ${series.volume || "?"} ml</span>`;
+      })
+      .join("");
+    this.element = element;
+    this.canvas = element.querySelector("canvas");
+    this.hover = element.querySelector(".hover");
+    container.appendChild(element);
+    this.fullRange = this.range(chart.series.map(series => slice(series.overview)));
+    this.listen();
+  }
+
+  range(points) {
+    let x0 = Infinity, x1 = -Infinity, y0 = Infinity, y1 = -Infinity;
+    for (const [xs, ys] of points) {
+      for (let i = 0; i < xs.length; i++) {
+        x0 = Math.min(x0, xs[i]); x1 = Math.max(x1, xs[i]);
+        y0 = Math.min(y0, ys[i]); y1 = Math.max(y1, ys[i]);
+      }
+    }
+    if (x0 === x1) { x0 -= 1; x1 += 1; }
+    if (y0 === y1) { y0 -= 1; y1 += 1; }
+    return { x0, x1, y0, y1 };
+  }
+
+  visiblePoints() {
+    const width = this.canvas.clientWidth;
+    return this.chart.series.map(series => {
+      if (this.zoom === null) return slice(series.overview);
+      // full-resolution points within the zoomed range, downsampled to the width of the canvas
+      const [xs, ys] = slice(series.full);
+      let start = 0, end = xs.length;
+      while (start < end && xs[start] < this.zoom.x0) start++;
+      while (end > start && xs[end - 1] > this.zoom.x1) end--;
+      const [zx, zy] = [xs.subarray(Math.max(0, start - 1), Math.min(xs.length, end + 1)),
+                        ys.subarray(Math.max(0, start - 1), Math.min(xs.length, end + 1))];
+      const kept = lttb(Array.from(zx), Array.from(zy), width);
+      return [Float64Array.from(kept, i => zx[i]), Float64Array.from(kept, i => zy[i])];
+    });
+  }
+
+  draw() {
+    const ratio = window.devicePixelRatio || 1;
+    const width = this.canvas.clientWidth, height = this.canvas.clientHeight;
+    this.canvas.width = width * ratio;
+    this.canvas.height = height * ratio;
+    const context = this.canvas.getContext("2d");
+    context.scale(ratio, ratio);
+    const points = this.visiblePoints();
+    const range = this.zoom === null ? this.fullRange : { ...this.range(points), x0: this.zoom.x0, x1: this.zoom.x1 };
+    const margin = { left: 50, right: 10, top: 10, bottom: 20 };
+    this.scale = {
+      range, margin, width, height,
+      x: x => margin.left + (x - range.x0) / (range.x1 - range.x0) * (width - margin.left - margin.right),
+      y: y => height - margin.bottom - (y - range.y0) / (range.y1 - range.y0) * (height - margin.top - margin.bottom),
+    };
+    context.clearRect(0, 0, width, height);
+    context.fillStyle = "#555";
+    context.font = "11px sans-serif";
+    context.fillText(range.y1.toFixed(2) + " €", 2, margin.top + 8);
+    context.fillText(range.y0.toFixed(2) + " €", 2, height - margin.bottom);
+    context.fillText(formatDay(Math.round(range.x0)), margin.left, height - 5);
+    context.fillText(formatDay(Math.round(range.x1)), width - margin.right - 65, height - 5);
+    context.save();
+    context.beginPath();
+    context.rect(margin.left, 0, width - margin.left - margin.right, height);
+    context.clip();
+    points.forEach(([xs, ys], i) => {
+      context.strokeStyle = COLORS[i % COLORS.length];
+      context.beginPath();
+      for (let j = 0; j < xs.length; j++) {
+        // prices only change at the recorded dates, hence the steps
+        const x = this.scale.x(xs[j]), y = this.scale.y(ys[j]);
+        if (j === 0) {
+          context.moveTo(x, y);
+        } else {
+          context.lineTo(x, this.scale.y(ys[j - 1]));
+          context.lineTo(x, y);
+        }
+      }
+      context.stroke();
+    });
+    context.restore();
+  }
+
+  toDay(event) {
+    const { range, margin, width } = this.scale;
+    const offset = event.offsetX - margin.left;
+    return range.x0 + offset / (width - margin.left - margin.right) * (range.x1 - range.x0);
+  }
+
+  listen() {
+    let dragStart = null;
+    this.canvas.addEventListener("mousedown", event => { dragStart = this.toDay(event); });
+    this.canvas.addEventListener("mouseup", event => {
+      const dragEnd = this.toDay(event);
+      if (dragStart !== null && Math.abs(dragEnd - dragStart) >= 1) {
+        this.zoom = { x0: Math.min(dragStart, dragEnd), x1: Math.max(dragStart, dragEnd) };
+        this.draw();
+      }
+      dragStart = null;
+    });
+    this.canvas.addEventListener("dblclick", () => { this.zoom = null; this.draw(); });
+    this.canvas.addEventListener("mousemove", event => {
+      if (this.scale === undefined) return;
+      const day = Math.round(this.toDay(event));
+      const values = this.chart.series.map(series => {
+        const [xs, ys] = slice(series.full);
+        let low = 0, high = xs.length - 1;
+        if (xs[0] > day) return null;
+        while (low < high) { const mid = (low + high + 1) >> 1; if (xs[mid] <= day) low = mid; else high = mid - 1; }
+        return `${series.volume || "?"} ml: ${ys[low].toFixed(2)} €`;
+      }).filter(value => value !== null);
+      this.hover.textContent = `${formatDay(day)}  ${values.join("  ")}`;
+    });
+  }
+}
+
+const container = document.getElementById("charts");
+// the charts are only drawn once they are scrolled into view, which keeps thousands of them responsive
+const observer = new IntersectionObserver(entries => {
+  for (const entry of entries) {
+    if (entry.isIntersecting) {
+      entry.target.chart.draw();
+      observer.unobserve(entry.target);
+    }
+  }
+}, { rootMargin: "200px" });
+const charts = CHARTS.map(chart => {
+  const view = new Chart(chart, container);
+  view.element.chart = view;
+  observer.observe(view.element);
+  return view;
+});
+document.getElementById("filter").addEventListener("input", event => {
+  const query = event.target.value.toLowerCase();
+  for (const view of charts) {
+    view.element.style.display = view.chart.title.toLowerCase().includes(query) ? "" : "none";
+  }
+});
+</script>
+</body>
+</html>
+"""
@@ -1,4 +1,11 @@
-from .data_structures import ProductInfo, ProductPrice
+from .data_structures import ListingEntry, ProductInfo, ProductPrice
+from .normalization import parse_price, parse_volume
+from .price_series import PriceSeries
 from .product import Product
 from .product_list import ProductList
-from .product_not_found import ProductNotFoundException, ProductPriceNotFoundException
+from .product_not_found import (
+    BlockedPageException,
+    ProductNotFoundException,
+    ProductPriceNotFoundException,
+    SearchTimeoutException,
+)
@@ -25,4 +25,13 @@ class ProductInfo(TypedDict):
     product_name: str
     description: str
     brand: str
+    url: str
     prices: List[ProductPrice]
+
+
+class ListingEntry(TypedDict):
+    product_name: str
+    description: str
+    brand: str
+    url: str
+    price: ProductPrice
@@ -0,0 +1,75 @@
+import re
+import warnings
+from typing import Any, Optional
+
+PRICE_PATTERN = r"\d+(?:[ \u00a0]\d{3})*(?:[.,]\d+)?"
+"""
+A price as displayed on the website, e.g. "26,00" or "1 250,50" (the thousands may be separated by a no-break space).
+"""
+
+MISSING_PRICES = (
+    "Product not available.",
+    "Price not found.",
+    "Info not found.",
+    "Info not found",
+)
+"""
+What older json files recorded instead of a price when the product was not available or its price was not found.
+"""
+
+
+def price_to_float(price: str) -> float:
+    """
+    Converts a price matching PRICE_PATTERN.
+
+    Args:
+        price: The price as displayed.
+
+    Returns:
+        The price as a float.
+    """
+    return float(re.sub(r"[ \u00a0]", "", price).replace(",", "."))
+
+
+def parse_price(price: Any) -> Optional[float]:
+    """
+    Normalises a recorded price, which is either a float or a string such as "26,00" or "1 050,00" in older json files.
+
+    Args:
+        price: The price as recorded.
+
+    Returns:
+        The price in euros, None if the product was not available or if the price was not found.
+
+    Raises:
+        ValueError: If the price contains digits but cannot be parsed, instead of losing it.
+    """
+    if price is None:
+        return None
+    if isinstance(price, (int, float)):
+        return float(price)
+    text = str(price).replace("€", "").strip()
+    if re.fullmatch(PRICE_PATTERN, text):
+        return price_to_float(text)
+    if re.search(r"\d", text):
+        raise ValueError(f"Unrecognised price: {price!r}.")
+    if text not in MISSING_PRICES:
+        warnings.warn(f"Unrecognised price {price!r} recorded as not available.")
+    return None
+
+
+def parse_volume(volume: Any) -> int:
+    """
+    Normalises a recorded volume, which is either an integer or a string such as "125 ml" in older json files.
+
+    Args:
+        volume: The volume as recorded.
+
+    Returns:
+        The volume in mL, 0 if it is unknown.
+    """
+    if isinstance(volume, int):
+        return volume
+    if isinstance(volume, str) and (match := re.search(r"\d+", volume)):
+        return int(match.group(0))
+    return 0
@@ -0,0 +1,158 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+DateRange = Union[str, List[str]]
+"""
+Either a single date or the first and last dates of a range of consecutive days, in format YYYY-MM-DD.
+"""
+
+
+def _next_day(iso_date: str) -> str:
+    return (date.fromisoformat(iso_date) + timedelta(days=1)).isoformat()
+
+
+def _expand(date_range: DateRange) -> Iterator[str]:
+    if isinstance(date_range, str):
+        yield date_range
+    else:
+        first, last = date.fromisoformat(date_range[0]), date.fromisoformat(
+            date_range[1]
+        )
+        for ordinal in range(first.toordinal(), last.toordinal() + 1):
+            yield date.fromordinal(ordinal).isoformat()
+
+
+class PriceSeries:
+    """
+    Prices recorded for one volume of a product, run-length encoded.
+    A run starts at each change of price and lists the dates on which this price was observed,
+    consecutive days being merged into ranges.
+    """
+
+    def __init__(
+        self, volume: Any = 0, runs: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Instantiates a series from its encoded runs.
+
+        Args:
+            volume: The volume of the product in mL, 0 if unknown (e.g. when the product is not available at all).
+            runs: The runs in chronological order, each one being a dictionary with keys "price" and "dates".
+        """
+        self.volume = volume
+        self.runs = runs if runs is not None else []
+
+    @classmethod
+    def from_json(cls, series: Dict[str, Any]) -> "PriceSeries":
+        return cls(series.get("volume", 0), series["runs"])
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"volume": self.volume, "runs": self.runs}
+
+    def is_normalized(self) -> bool:
+        """
+        Checks whether the series follows the current format, older json files recording volumes such as "125 ml"
+        and prices such as "26,00".
+
+        Returns:
+            True if the volume is an integer and every price a float or None.
+        """
+        return (
+            isinstance(self.volume, int)
+            and not isinstance(self.volume, bool)
+            and all(
+                run["price"] is None or isinstance(run["price"], float)
+                for run in self.runs
+            )
+        )
+
+    @property
+    def last_date(self) -> Optional[str]:
+        if len(self.runs) == 0:
+            return None
+        last_range = self.runs[-1]["dates"][-1]
+        return last_range if isinstance(last_range, str) else last_range[1]
+
+    def append(self, price: Any, record_date: str) -> None:
+        """
+        Appends a price without checking for duplicates, extending the current run if the price did not change.
+
+        Args:
+            price: The price in euros, None if not available.
+            record_date: The date of the snapshot, assumed not to be older than the last one recorded.
+        """
+        if len(self.runs) == 0 or self.runs[-1]["price"] != price:
+            self.runs.append({"price": price, "dates": [record_date]})
+            return
+
+        dates = self.runs[-1]["dates"]
+        last_range = dates[-1]
+        last_date = last_range if isinstance(last_range, str) else last_range[1]
+        if _next_day(last_date) != record_date:
+            dates.append(record_date)
+        elif isinstance(last_range, str):
+            dates[-1] = [last_range, record_date]
+        else:
+            last_range[1] = record_date
+
+    def add(self, price: Any, record_date: str) -> bool:
+        """
+        Adds a price to the series unless a price has already been recorded on the same date.
+
+        Args:
+            price: The price in euros, None if not available.
+            record_date: The date of the snapshot in format YYYY-MM-DD.
+
+        Returns:
+            True if the price was added, False otherwise.
+        """
+        if (last_date := self.last_date) is None or record_date > last_date:
+            self.append(price, record_date)
+            return True
+        if any(record_date == observed_date for _, observed_date in self.items()):
+            return False
+
+        # out-of-order record: the series is re-encoded
+        items = sorted([*self.items(), (price, record_date)], key=lambda item: item[1])
+        self.runs = []
+        for item_price, item_date in items:
+            self.append(item_price, item_date)
+        return True
+
+    def items(self) -> Iterator[tuple]:
+        """
+        Decodes the series.
+
+        Yields:
+            Each price along with its date, in chronological order.
+        """
+        for run in self.runs:
+            yield from self.items_of_run(run)
+
+    @staticmethod
+    def items_of_run(run: Dict[str, Any]) -> Iterator[tuple]:
+        """
+        Decodes a single run of a series.
+
+        Args:
+            run: The run to decode.
+
+        Yields:
+            The price of the run along with each date it was observed on.
+        """
+        for date_range in run["dates"]:
+            for observed_date in _expand(date_range):
+                yield run["price"], observed_date
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """
+        Decodes the series into the records of the plain json format.
+
+        Yields:
+            Dictionaries with keys "price", "volume" and "date", in chronological order.
+        """
+        for price, observed_date in self.items():
+            yield {"price": price, "volume": self.volume, "date": observed_date}
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.items())
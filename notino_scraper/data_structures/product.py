@@ -1,12 +1,17 @@
-from typing import List
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Union
 
 from notino_scraper.data_structures import ProductInfo, ProductPrice
+from .normalization import parse_price, parse_volume
+from .price_series import PriceSeries
 
 
 class Product:
-    def __init__(self, product_info: ProductInfo) -> None:
+    def __init__(self, product_info: Union[ProductInfo, Dict[str, Any]]) -> None:
         """
         Instantiates a new Product with the information provided. Creates an empty list of prices of none is given.
+        The prices are either given as a list of records or as the encoded series read from the json file,
+        in which case they are only decoded when accessed.
 
         Args:
             product_info: The information available on the product. Usually extracted using a Scraper.
@@ -14,7 +19,88 @@ class Product:
         self.product_name = product_info["product_name"]
         self.description = product_info["description"]
         self.brand = product_info["brand"]
-        self.prices = product_info["prices"]
+        # products recorded before the url was tracked do not have one
+        self.url = product_info.get("url", "")
+        # fingerprint of the price section of the product page when the prices were last extracted
+        self.fingerprint = product_info.get("fingerprint", "")
+        # prices extracted from the page with this fingerprint, reused as long as the page does not change
+        self.fingerprint_prices: List[Dict[str, Any]] = product_info.get(
+            "fingerprint_prices", []
+        )
+        self._encoded_series: Optional[List[Dict[str, Any]]] = None
+        self._series: Optional[Dict[int, PriceSeries]] = None
+        self._prices: Optional[List[Dict[str, Any]]] = None
+        if "series" in product_info:
+            encoded_series = [
+                PriceSeries.from_json(series) for series in product_info["series"]
+            ]
+            if all(series.is_normalized() for series in encoded_series) and len(
+                {series.volume for series in encoded_series}
+            ) == len(encoded_series):
+                self._encoded_series = product_info["series"]
+                return
+            # series written by older versions are normalised, merging the volumes that refer to the same one
+            records = [
+                record for series in encoded_series for record in series.records()
+            ]
+        else:
+            records = product_info["prices"]
+        self._series = {}
+        self._add_records(
+            sorted(
+                (self._to_record(record) for record in records),
+                key=lambda record: record["date"],
+            ),
+            check_duplicates=False,
+        )
+
+    @staticmethod
+    def _to_record(price: Union[ProductPrice, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Normalises a price so that each volume is recorded under a single key and each price as a float.
+
+        Args:
+            price: The price, either just extracted or read from an older json file.
+
+        Returns:
+            A record with keys "price", "volume" and "date".
+        """
+        record = asdict(price) if isinstance(price, ProductPrice) else price
+        return {
+            "price": parse_price(record["price"]),
+            "volume": parse_volume(record.get("volume")),
+            "date": record["date"],
+        }
+
+    @property
+    def series(self) -> Dict[int, PriceSeries]:
+        """
+        The series of prices of each volume, keyed by volume in mL.
+        """
+        if self._series is None:
+            self._series = {}
+            for encoded_series in self._encoded_series:
+                series = PriceSeries.from_json(encoded_series)
+                self._series[series.volume] = series
+            self._encoded_series = None
+        return self._series
+
+    @property
+    def prices(self) -> List[Dict[str, Any]]:
+        """
+        The records of every price, decoded on first access and ordered by date.
+        They should not be modified, use add_prices instead.
+        """
+        if self._prices is None:
+            self._prices = sorted(
+                (
+                    record
+                    for series in self.series.values()
+                    for record in series.records()
+                ),
+                key=lambda record: record["date"],
+            )
+        return self._prices
 
     def __repr__(self) -> str:
         """
@@ -40,10 +126,18 @@ class Product:
         Returns:
             True if the two Products refer to the same item on the website.
         """
+        # names read from the search bar are html-escaped while the ones read from listing tiles are not
         return (
-            self.product_name.lower() == other.product_name.lower()
-            and (self.description.lower() == other.description.lower())
-            and (self.brand.lower() == other.brand.lower())
+            self.product_name.replace("&amp;", "&").lower()
+            == other.product_name.replace("&amp;", "&").lower()
+            and (
+                self.description.replace("&amp;", "&").lower()
+                == other.description.replace("&amp;", "&").lower()
+            )
+            and (
+                self.brand.replace("&amp;", "&").lower()
+                == other.brand.replace("&amp;", "&").lower()
+            )
         )
 
     def __add__(self, other):
@@ -61,22 +155,116 @@ class Product:
                 "Trying to add two Products that do not refer to the same item on the website."
             )
         else:
-            self.prices += other.prices
+            self._add_records(other.prices, check_duplicates=True)
+            self.url = other.url or self.url
             return self
 
-    def add_prices(self, prices: List[ProductPrice]) -> None:
+    def _add_records(
+        self, records: List[Dict[str, Any]], check_duplicates: bool
+    ) -> List[Dict[str, Any]]:
+        added_records = []
+        for record in records:
+            volume = record["volume"]
+            if (series := self.series.get(volume)) is None:
+                series = self.series[volume] = PriceSeries(volume)
+            if check_duplicates:
+                if not series.add(record["price"], record["date"]):
+                    continue
+            else:
+                # keeps the duplicates that older json files might contain
+                series.append(record["price"], record["date"])
+            added_records.append(record)
+        self._prices = None
+        return added_records
+
+    def add_prices(self, prices: List[ProductPrice]) -> List[ProductPrice]:
         """
         Adds a price to the list of prices recorded.
+        A price is not added if there is already one for the same date and volume.
 
         Args:
             prices: The prices to add.
+
+        Returns:
+            The prices actually added, normalised.
+        """
+        return [
+            ProductPrice(**record)
+            for record in self._add_records(
+                [self._to_record(price) for price in prices], check_duplicates=True
+            )
+        ]
+
+    def set_fingerprint(self, fingerprint: str, prices: List[ProductPrice]) -> None:
+        """
+        Records the fingerprint of the prices section of the product page along with the prices extracted from it.
+
+        Args:
+            fingerprint: The fingerprint of the section, an empty string if it could not be found.
+            prices: The prices extracted from the page.
+        """
+        self.fingerprint = fingerprint
+        self.fingerprint_prices = [
+            {"price": record["price"], "volume": record["volume"]}
+            for record in (self._to_record(price) for price in prices)
+        ]
+
+    def get_fingerprint_prices(self, price_date: str) -> List[ProductPrice]:
+        """
+        Rebuilds the prices extracted from the page when its fingerprint was recorded.
+
+        Args:
+            price_date: The date to give to the prices in format YYYY-MM-DD.
+
+        Returns:
+            The prices of each volume, an empty list if none was recorded along with the fingerprint.
+        """
+        return [
+            ProductPrice(price=price["price"], volume=price["volume"], date=price_date)
+            for price in self.fingerprint_prices
+        ]
+
+    def get_snapshot_state(self) -> Dict[str, Any]:
+        """
+        Computes what a snapshot reads and updates besides the prices, e.g. to hand the product over to a worker.
+
+        Returns:
+            The features of the product, the url of its page and the fingerprint of its prices section along with the
+            prices extracted from it.
+        """
+        return {
+            "product_name": self.product_name,
+            "description": self.description,
+            "brand": self.brand,
+            "url": self.url,
+            "fingerprint": self.fingerprint,
+            "fingerprint_prices": self.fingerprint_prices,
+        }
+
+    def set_snapshot_state(self, state: Dict[str, Any]) -> None:
+        """
+        Updates the url and the fingerprint of the product with the ones found by a snapshot taken elsewhere.
+
+        Args:
+            state: The state computed by get_snapshot_state on the copy of the product the snapshot was taken on.
+        """
+        self.url = state["url"]
+        self.fingerprint = state["fingerprint"]
+        self.fingerprint_prices = state["fingerprint_prices"]
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Computes the representation of the product stored in the json file.
+
+        Returns:
+            A dictionary with the features of the product and its encoded series of prices.
         """
-        for price_info in prices:
-            if all(
-                (price_info.date, price_info.volume) != (price.date, price.volume)
-                for price in self.prices
-            ):
-                self.prices.append(price_info)
+        return {
+            **self.get_snapshot_state(),
+            "series": self._encoded_series
+            if self._encoded_series is not None
+            else [series.to_json() for series in self.series.values()],
+        }
 
     def get_search_name(self) -> str:
         """
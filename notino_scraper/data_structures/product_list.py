@@ -1,6 +1,6 @@
 import json
 import traceback
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from .product import Product
 
@@ -9,6 +9,7 @@ class ProductList:
     def __init__(self, filename: str) -> None:
         """
         Parses the json file under the name filename and dumps the data read into the 'products' attribute.
+        Both the plain list of prices and the encoded series of prices are supported, the latter being used on save.
 
         Args:
             filename: The path that leads to the json file to read.
@@ -18,6 +19,10 @@ class ProductList:
         with open(filename) as json_file:
             products = json.load(json_file)
         self.products = [Product(product) for product in products]
+        # index of the products under the key they are compared with, maintained by add_product and add_products
+        self._index: Dict[Tuple[str, str, str], Product] = {
+            self._key(product): product for product in self.products
+        }
 
     def __repr__(self) -> str:
         """
@@ -40,6 +45,22 @@ class ProductList:
         """
         return self.products
 
+    def find_product(
+        self, product_name: str, description: str, brand: str
+    ) -> Optional[Product]:
+        """
+        Finds a tracked product from its name, description and brand, regardless of the case.
+
+        Args:
+            product_name: The name of the product as displayed on the website.
+            description: The description of the product (e.g. Eau de Parfum pour femme).
+            brand: The brand of the product.
+
+        Returns:
+            The product if it is tracked, None otherwise.
+        """
+        return self._index.get(self._normalize_key(product_name, description, brand))
+
     def save(self) -> None:
         """
         Saves the content back into the json file.
@@ -49,7 +70,11 @@ class ProductList:
 
         try:
             with open(self.filename, "w") as json_file:
-                json.dump([product.__dict__ for product in self.products], json_file)
+                json.dump(
+                    [product.to_json() for product in self.products],
+                    json_file,
+                    separators=(",", ":"),
+                )
         except IOError:
             print(f"An issue was raised when saving the json file:\n")
             print(traceback.format_exc())
@@ -65,15 +90,54 @@ class ProductList:
             verbose: Verbose.
         """
         new_product = Product(product_info)
-        for product in self.products:
-            if product == new_product:
-                product += new_product
-                if verbose:
-                    print("Product already in the list.")
-                    print(product)
-                break
-        # else clause if new_product has not been found in the list of products.
+        if (product := self._index.get(self._key(new_product))) is not None:
+            product += new_product
+            if verbose:
+                print("Product already in the list.")
+                print(product)
         else:
+            self._index[self._key(new_product)] = new_product
             self.products.append(new_product)
             if verbose:
                 print(new_product)
+
+    def add_products(self, product_infos: List[dict]) -> List[Tuple[Product, bool]]:
+        """
+        Adds several products to the list of products in a single pass.
+
+        Args:
+            product_infos: Dictionaries containing the information known on each product.
+
+        Returns:
+            The product of the list each piece of information was merged into, and whether it was not tracked yet.
+        """
+        merged = []
+        for product_info in product_infos:
+            new_product = Product(product_info)
+            if (product := self._index.get(self._key(new_product))) is not None:
+                product += new_product
+                merged.append((product, False))
+            else:
+                self._index[self._key(new_product)] = new_product
+                self.products.append(new_product)
+                merged.append((new_product, True))
+        return merged
+
+    @staticmethod
+    def _normalize_key(
+        product_name: str, description: str, brand: str
+    ) -> Tuple[str, str, str]:
+        return (
+            product_name.replace("&amp;", "&").lower(),
+            description.replace("&amp;", "&").lower(),
+            brand.replace("&amp;", "&").lower(),
+        )
+
+    @classmethod
+    def _key(cls, product: Product) -> Tuple[str, str, str]:
+        """
+        Key under which two products are equal, see Product.__eq__.
+        """
+        return cls._normalize_key(
+            product.product_name, product.description, product.brand
+        )
@@ -5,8 +5,22 @@ class ProductNotFoundException(Exception):
         super().__init__(self.message)
 
 
+class SearchTimeoutException(ProductNotFoundException):
+    def __init__(
+        self, product: str, message: str = "Search results not displayed in time."
+    ) -> None:
+        super().__init__(product, message)
+
+
 class ProductPriceNotFoundException(Exception):
     def __init__(self, product: str, message: str = "Product price not found.") -> None:
         self.product = product
         self.message = message
         super().__init__(self.message)
+
+
+class BlockedPageException(Exception):
+    def __init__(self, url: str, message: str = "Page blocked by the website.") -> None:
+        self.url = url
+        self.message = message
+        super().__init__(self.message)
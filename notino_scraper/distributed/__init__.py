@@ -0,0 +1,2 @@
+from .job_queue import Job, JobQueue
+from .worker import run_worker
@@ -0,0 +1,265 @@
+import json
+import sqlite3
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from notino_scraper.data_structures import Product, ProductPrice
+
+
+@dataclass
+class Job:
+    job_id: int
+    run_id: str
+    product_key: int
+    """
+    Position of the product in the ProductList of the coordinator.
+    """
+    search_name: str
+    attempts: int = 0
+    product: Dict[str, Any] = field(default_factory=dict)
+    """
+    Snapshot state of the product (see Product.get_snapshot_state), as updated by the worker once the job is done.
+    """
+
+
+class JobQueue:
+    """
+    Durable queue of snapshot jobs stored in a SQLite file.
+    The file can be put on a shared storage so that workers on several nodes can lease jobs from it.
+    A leased job is invisible to the other workers until its lease expires, it is then put back in the queue.
+    """
+
+    PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+    def __init__(self, filename: str, timeout: float = 30.0) -> None:
+        """
+        Opens the queue stored in filename and creates it if it does not exist yet.
+
+        Args:
+            filename: The path to the SQLite file.
+            timeout: How long to wait for the lock of the file before giving up, in seconds.
+        """
+        self.filename = filename
+        # the default rollback journal is used since WAL does not work on network file systems
+        self.connection = sqlite3.connect(
+            filename, timeout=timeout, isolation_level=None
+        )
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                product_key INTEGER NOT NULL,
+                search_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                lease_expiry REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                product TEXT NOT NULL DEFAULT '{}'
+            )
+            """
+        )
+        # queues created before the url and the fingerprint were handed over to the workers
+        if "product" not in {
+            row[1] for row in self.connection.execute("PRAGMA table_info(jobs)")
+        }:
+            self.connection.execute(
+                "ALTER TABLE jobs ADD COLUMN product TEXT NOT NULL DEFAULT '{}'"
+            )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expiry)"
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def enqueue(self, run_id: str, products: List[Tuple[int, Product]]) -> None:
+        """
+        Adds one job per product to the queue, along with the url and the fingerprint of its page.
+
+        Args:
+            run_id: The identifier of the snapshot the jobs belong to.
+            products: The key and the product of each job.
+        """
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.executemany(
+                "INSERT INTO jobs (run_id, product_key, search_name, status, product) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        key,
+                        product.get_search_name(),
+                        self.PENDING,
+                        json.dumps(product.get_snapshot_state()),
+                    )
+                    for key, product in products
+                ],
+            )
+
+    def _requeue_expired(self, now: float) -> int:
+        return self.connection.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_expiry = NULL "
+            "WHERE status = ? AND lease_expiry < ?",
+            (self.PENDING, self.LEASED, now),
+        ).rowcount
+
+    def requeue_expired(self) -> int:
+        """
+        Puts the jobs whose lease has expired back in the queue.
+
+        Returns:
+            The number of jobs put back in the queue.
+        """
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            return self._requeue_expired(time.time())
+
+    def lease(self, worker: str, visibility_timeout: float) -> Optional[Job]:
+        """
+        Leases the oldest pending job. The lock taken by BEGIN IMMEDIATE makes sure a job is leased only once.
+
+        Args:
+            worker: The identifier of the worker.
+            visibility_timeout: The duration of the lease in seconds.
+
+        Returns:
+            The leased job, None if the queue is empty.
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self._requeue_expired(now)
+            row = self.connection.execute(
+                "SELECT job_id, run_id, product_key, search_name, attempts, product FROM jobs "
+                "WHERE status = ? ORDER BY job_id LIMIT 1",
+                (self.PENDING,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expiry = ?, attempts = attempts + 1 "
+                "WHERE job_id = ?",
+                (self.LEASED, worker, now + visibility_timeout, row[0]),
+            )
+        return Job(*row[:4], attempts=row[4] + 1, product=json.loads(row[5]))
+
+    def complete(
+        self, job: Job, worker: str, prices: List[ProductPrice], product: Product
+    ) -> bool:
+        """
+        Writes the result of a job back into the queue.
+
+        Args:
+            job: The job leased.
+            worker: The identifier of the worker that leased the job.
+            prices: The prices scraped.
+            product: The product the snapshot was taken on, whose url and fingerprint are handed back.
+
+        Returns:
+            False if the lease was lost in the meantime, in which case the result is dropped.
+        """
+        return self._finish(
+            job,
+            worker,
+            self.DONE,
+            json.dumps(
+                {
+                    "prices": [asdict(price) for price in prices],
+                    "product": product.get_snapshot_state(),
+                }
+            ),
+            None,
+        )
+
+    def fail(self, job: Job, worker: str, error: str, max_attempts: int = 3) -> bool:
+        """
+        Records the failure of a job. The job is put back in the queue unless it already failed max_attempts times.
+
+        Args:
+            job: The job leased.
+            worker: The identifier of the worker that leased the job.
+            error: The description of the error.
+            max_attempts: The number of attempts after which the job is dropped.
+
+        Returns:
+            False if the lease was lost in the meantime.
+        """
+        status = self.FAILED if job.attempts >= max_attempts else self.PENDING
+        return self._finish(job, worker, status, None, error)
+
+    def _finish(
+        self,
+        job: Job,
+        worker: str,
+        status: str,
+        result: Optional[str],
+        error: Optional[str],
+    ) -> bool:
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            return (
+                self.connection.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, lease_expiry = NULL, result = ?, error = ? "
+                    "WHERE job_id = ? AND status = ? AND worker = ?",
+                    (status, result, error, job.job_id, self.LEASED, worker),
+                ).rowcount
+                == 1
+            )
+
+    def count_unfinished(self, run_id: str) -> int:
+        """
+        Counts the jobs of a snapshot that are either pending or leased.
+
+        Args:
+            run_id: The identifier of the snapshot.
+
+        Returns:
+            The number of jobs left.
+        """
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND status IN (?, ?)",
+            (run_id, self.PENDING, self.LEASED),
+        ).fetchone()[0]
+
+    def results(
+        self, run_id: str
+    ) -> Iterator[Tuple[Job, Optional[List[ProductPrice]], Optional[str]]]:
+        """
+        Iterates over the finished jobs of a snapshot.
+
+        Args:
+            run_id: The identifier of the snapshot.
+
+        Yields:
+            Each job along with the prices scraped, or the error raised if the job failed.
+            The snapshot state of the job is the one handed back by the worker if the job is done.
+        """
+        for row in self.connection.execute(
+            "SELECT job_id, run_id, product_key, search_name, attempts, result, error, product FROM jobs "
+            "WHERE run_id = ? AND status IN (?, ?) ORDER BY job_id",
+            (run_id, self.DONE, self.FAILED),
+        ):
+            if row[5] is None:
+                yield Job(*row[:5], product=json.loads(row[7])), None, row[6]
+            else:
+                result = json.loads(row[5])
+                yield (
+                    Job(*row[:5], product=result["product"]),
+                    [ProductPrice(**price) for price in result["prices"]],
+                    row[6],
+                )
+
+    def purge(self, run_id: str) -> None:
+        """
+        Deletes every job of a snapshot once its results have been merged.
+
+        Args:
+            run_id: The identifier of the snapshot.
+        """
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("DELETE FROM jobs WHERE run_id = ?", (run_id,))
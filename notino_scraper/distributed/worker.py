@@ -0,0 +1,89 @@
+import os
+import socket
+import time
+import traceback
+from typing import Callable, Optional
+
+from notino_scraper.data_structures import (
+    Product,
+    ProductNotFoundException,
+    SearchTimeoutException,
+)
+from notino_scraper.scraper import Scraper
+from .job_queue import JobQueue
+
+
+def run_worker(
+    queue_file: str,
+    worker: Optional[str] = None,
+    run_id: Optional[str] = None,
+    visibility_timeout: float = 300.0,
+    idle_timeout: Optional[float] = 60.0,
+    poll_interval: float = 1.0,
+    scraper_factory: Callable[[], Scraper] = Scraper,
+    verbose: bool = True,
+) -> int:
+    """
+    Leases snapshot jobs from the queue, scrapes the prices and writes them back until the queue stays empty.
+    The product pages are opened from their recorded url and the prices are only extracted again if their fingerprint
+    changed, the updated url and fingerprint being written back along with the prices.
+    Any number of workers can run on any number of nodes as long as they share the queue file.
+
+    Args:
+        queue_file: The path to the SQLite file of the queue.
+        worker: The identifier of the worker, defaults to the host name and the pid.
+        run_id: If given, the worker stops as soon as this snapshot has no job left, pending or leased,
+            and keeps waiting for the leases of other workers to expire until then, whatever idle_timeout.
+        visibility_timeout: The duration of a lease in seconds, the job is handed to another worker past it.
+        idle_timeout: How long to wait for new jobs before stopping, in seconds. None means never stopping.
+        poll_interval: How long to wait between two polls of an empty queue, in seconds.
+        scraper_factory: Instantiates the object used to fetch the prices, only called once a job is leased.
+        verbose: The level of verbose to use. True means more messages printed.
+
+    Returns:
+        The number of jobs processed.
+    """
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    queue = JobQueue(queue_file)
+    scraper: Optional[Scraper] = None
+    n_processed, idle_since = 0, time.monotonic()
+    try:
+        while True:
+            if (job := queue.lease(worker, visibility_timeout)) is None:
+                if run_id is not None:
+                    if queue.count_unfinished(run_id) == 0:
+                        break
+                elif (
+                    idle_timeout is not None
+                    and time.monotonic() - idle_since > idle_timeout
+                ):
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            if verbose:
+                print(f"[{worker}] Adding the price of: {job.search_name}")
+            try:
+                if scraper is None:
+                    scraper = scraper_factory()
+                # the copy of the product only holds what the snapshot needs: its url and fingerprint
+                product = Product({**job.product, "series": []})
+                lease_kept = queue.complete(
+                    job, worker, scraper.snapshot_product(product), product
+                )
+            except SearchTimeoutException:
+                lease_kept = queue.fail(job, worker, traceback.format_exc())
+            except ProductNotFoundException:
+                # retrying would not help
+                lease_kept = queue.fail(
+                    job, worker, "Product not found.", max_attempts=0
+                )
+            except Exception:
+                lease_kept = queue.fail(job, worker, traceback.format_exc())
+            if verbose and not lease_kept:
+                print(f"[{worker}] Lease expired for: {job.search_name}")
+            n_processed += 1
+            idle_since = time.monotonic()
+    finally:
+        queue.close()
+    return n_processed
@@ -0,0 +1,204 @@
+import csv
+import datetime
+import html
+import os
+from typing import Any, Dict, Iterator, List
+
+from .data_structures import ProductList
+
+EXPORT_COLUMNS = ("product", "brand", "description", "volume_ml", "date", "price")
+"""
+Columns of the exported tables, one row per price recorded.
+"""
+
+
+def iter_rows(product_list: ProductList) -> Iterator[tuple]:
+    """
+    Streams the prices recorded in a long format, without decoding the whole history of a product at once.
+    Each feature is normalised once: per product for the texts, per series for the volume and per run for the price.
+
+    Args:
+        product_list: The products to export.
+
+    Yields:
+        Tuples whose values follow EXPORT_COLUMNS.
+    """
+    for product in product_list.get_products():
+        product_name, brand, description = (
+            html.unescape(product.product_name),
+            html.unescape(product.brand),
+            html.unescape(product.description),
+        )
+        for series in product.series.values():
+            for price, price_date in series.items():
+                yield product_name, brand, description, series.volume, price_date, price
+
+
+def iter_batches(
+    product_list: ProductList, batch_size: int
+) -> Iterator[Dict[str, List[Any]]]:
+    """
+    Groups the rows into columnar record batches of fixed size.
+
+    Args:
+        product_list: The products to export.
+        batch_size: The number of rows per batch, the last batch may be smaller.
+
+    Yields:
+        Dictionaries that map each column to its values.
+    """
+    batch: Dict[str, List[Any]] = {column: [] for column in EXPORT_COLUMNS}
+    n_rows = 0
+    for row in iter_rows(product_list):
+        for column, value in zip(EXPORT_COLUMNS, row):
+            batch[column].append(value)
+        n_rows += 1
+        if n_rows == batch_size:
+            yield batch
+            batch, n_rows = {column: [] for column in EXPORT_COLUMNS}, 0
+    if n_rows > 0:
+        yield batch
+
+
+def export_csv(
+    product_list: ProductList, filename: str, batch_size: int = 65536
+) -> int:
+    """
+    Exports the prices recorded to a csv file.
+
+    Args:
+        product_list: The products to export.
+        filename: The path of the csv file to write.
+        batch_size: The number of rows written at once.
+
+    Returns:
+        The number of rows written.
+    """
+    n_rows = 0
+    with open(filename, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(EXPORT_COLUMNS)
+        for batch in iter_batches(product_list, batch_size):
+            writer.writerows(zip(*(batch[column] for column in EXPORT_COLUMNS)))
+            n_rows += len(batch["date"])
+    return n_rows
+
+
+def _arrow_batches(product_list: ProductList, batch_size: int):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError(
+            "pyarrow is needed to export to Parquet or Arrow: pip install pyarrow"
+        )
+
+    schema = pa.schema(
+        [
+            ("product", pa.string()),
+            ("brand", pa.string()),
+            ("description", pa.string()),
+            ("volume_ml", pa.int32()),
+            ("date", pa.date32()),
+            ("price", pa.float64()),
+        ]
+    )
+
+    def batches():
+        for batch in iter_batches(product_list, batch_size):
+            yield pa.record_batch(
+                [
+                    pa.array(batch["product"], pa.string()),
+                    pa.array(batch["brand"], pa.string()),
+                    pa.array(batch["description"], pa.string()),
+                    pa.array(batch["volume_ml"], pa.int32()),
+                    pa.array(
+                        [
+                            datetime.date.fromisoformat(price_date)
+                            for price_date in batch["date"]
+                        ],
+                        pa.date32(),
+                    ),
+                    pa.array(batch["price"], pa.float64()),
+                ],
+                schema=schema,
+            )
+
+    return schema, batches()
+
+
+def export_parquet(
+    product_list: ProductList, filename: str, batch_size: int = 65536
+) -> int:
+    """
+    Exports the prices recorded to a Parquet file, one row group per batch.
+
+    Args:
+        product_list: The products to export.
+        filename: The path of the Parquet file to write.
+        batch_size: The number of rows per row group.
+
+    Returns:
+        The number of rows written.
+    """
+    # imported once _arrow_batches checked that pyarrow is installed
+    schema, batches = _arrow_batches(product_list, batch_size)
+    import pyarrow.parquet as pq
+
+    n_rows = 0
+    with pq.ParquetWriter(filename, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            n_rows += batch.num_rows
+    return n_rows
+
+
+def export_arrow(
+    product_list: ProductList, filename: str, batch_size: int = 65536
+) -> int:
+    """
+    Exports the prices recorded to an Arrow IPC file (also known as Feather v2), which can be memory-mapped.
+
+    Args:
+        product_list: The products to export.
+        filename: The path of the Arrow file to write.
+        batch_size: The number of rows per record batch.
+
+    Returns:
+        The number of rows written.
+    """
+    schema, batches = _arrow_batches(product_list, batch_size)
+    import pyarrow as pa
+
+    n_rows = 0
+    with pa.OSFile(filename, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+            n_rows += batch.num_rows
+    return n_rows
+
+
+EXPORTERS = {
+    ".csv": export_csv,
+    ".parquet": export_parquet,
+    ".arrow": export_arrow,
+    ".feather": export_arrow,
+}
+
+
+def export(product_list: ProductList, filename: str, batch_size: int = 65536) -> int:
+    """
+    Exports the prices recorded to a file whose format is inferred from its extension (csv, parquet, arrow, feather).
+
+    Args:
+        product_list: The products to export.
+        filename: The path of the file to write.
+        batch_size: The number of rows per batch.
+
+    Returns:
+        The number of rows written.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    assert (
+        extension in EXPORTERS
+    ), f"Unsupported export format, please use one of: {', '.join(EXPORTERS)}."
+    return EXPORTERS[extension](product_list, filename, batch_size)
@@ -1,15 +1,35 @@
 import datetime
+import multiprocessing
 import os
+import queue
+import time
+import traceback
+import uuid
 from collections import defaultdict
-from typing import DefaultDict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import DefaultDict, Iterable, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import seaborn as sns
 from yaml import safe_load
 
 from .config_handler import update_datafile, update_img_folder
-from .data_structures import Product, ProductList, ProductNotFoundException
-from .scraper import Scraper
+from .best_deals import BestDealIndex
+from .dashboard import write_dashboard
+from .distributed import JobQueue, run_worker
+from .exporters import export
+from .printer import ProductPrinter
+from .registration import RegistrationReport, normalize_product_names
+from .data_structures import (
+    BlockedPageException,
+    Product,
+    ProductInfo,
+    ProductList,
+    ProductNotFoundException,
+    ProductPriceNotFoundException,
+)
+from .scraper import AdaptiveConcurrencyController, Scraper, SearchCache, TabPipeline
 
 
 class NotinoScraper:
@@ -19,13 +39,15 @@ class NotinoScraper:
 
     def __init__(self, verbose: bool = True, debug_mode: bool = False) -> None:
         """
-        Loads the config and instantiates a Scraper and a ProductList.
+        Loads the config and instantiates a ProductList and a SearchCache.
+        The Scraper is instantiated when first needed.
 
         Args:
             verbose: The level of verbose to use. True means more messages printed.
         """
         self.verbose = verbose
-        self.scraper = Scraper(headless=not debug_mode)
+        self.debug_mode = debug_mode
+        self._scraper: Optional[Scraper] = None
         while True:
             try:
                 with open(self.config_file, "r") as stream:
@@ -38,22 +60,228 @@ class NotinoScraper:
                     self.config_file,
                     input("Please specify the path to the output json file: "),
                 )
+        self.search_cache = SearchCache(
+            config.get("search_cache", "./search_cache.sqlite"),
+            ttl=float(config.get("search_cache_ttl", 168)) * 3600,
+            negative_ttl=float(config.get("search_cache_negative_ttl", 24)) * 3600,
+        )
+
+    @property
+    def scraper(self) -> Scraper:
+        """
+        The Scraper is only instantiated when first needed since it launches a browser.
+        """
+        if self._scraper is None:
+            self._scraper = Scraper(
+                headless=not self.debug_mode, search_cache=self.search_cache
+            )
+        return self._scraper
 
-    def take_snapshot(self) -> None:
+    def take_snapshot(
+        self,
+        queue_file: str = "",
+        local_workers: int = 0,
+        visibility_timeout: float = 300.0,
+        poll_interval: float = 5.0,
+        tabs: int = 1,
+        adaptive: bool = False,
+    ) -> None:
         """
         Snapshots the prices of every product in the list.
+
+        Args:
+            queue_file: The path to the SQLite file of a job queue shared with workers.
+                The snapshot is taken in the current process if it is empty.
+            local_workers: The number of worker processes to start on this node when using a job queue.
+            visibility_timeout: The duration of a lease in seconds when using a job queue.
+            poll_interval: How often the job queue is checked for completion, in seconds.
+            tabs: The number of pages loaded at the same time in the tabs of the browser.
+            adaptive: Whether the number of pages loaded at the same time is adjusted between 1 and tabs
+                according to the latency and the errors observed.
         """
-        for product in self.product_list.get_products():
-            if self.verbose:
-                print(f"Adding the price of: {product.get_search_name()}")
-            try:
-                product.add_prices(self.scraper.get_prices(product.get_search_name()))
-            except ProductNotFoundException:
+        if queue_file != "":
+            self._take_distributed_snapshot(
+                queue_file, local_workers, visibility_timeout, poll_interval
+            )
+            return
+
+        deal_index = BestDealIndex.load_or_build(
+            self.product_list.filename, self.product_list
+        )
+        self.scraper.fingerprint_hits, self.scraper.fingerprint_misses = 0, 0
+        if tabs > 1:
+            pipeline = TabPipeline(
+                self.scraper,
+                tabs,
+                controller=AdaptiveConcurrencyController(1, tabs, verbose=self.verbose)
+                if adaptive
+                else None,
+            )
+            for product, prices, error in pipeline.snapshot(
+                self.product_list.get_products()
+            ):
+                if prices is not None:
+                    if self.verbose:
+                        print(f"Adding the price of: {product.get_search_name()}")
+                    deal_index.update(product, product.add_prices(prices))
+                elif self.verbose:
+                    print(f"Prices not found for: {product.get_search_name()}\n{error}")
+        else:
+            for product in self.product_list.get_products():
                 if self.verbose:
-                    print(f"Prices not found for: {product.get_search_name()}")
+                    print(f"Adding the price of: {product.get_search_name()}")
+                try:
+                    prices = self.scraper.snapshot_product(product)
+                    deal_index.update(product, product.add_prices(prices))
+                except (ProductNotFoundException, ProductPriceNotFoundException):
+                    if self.verbose:
+                        print(f"Prices not found for: {product.get_search_name()}")
+                except Exception:
+                    # as in the tab pipeline, one failing page does not lose the prices of the whole snapshot
+                    if self.verbose:
+                        print(
+                            f"Prices not found for: {product.get_search_name()}\n{traceback.format_exc()}"
+                        )
         self.product_list.save()
+        deal_index.save()
+        if self.verbose:
+            print(self.product_list)
+            if tabs > 1:
+                pipeline.print_statistics()
+            n_pages = self.scraper.fingerprint_hits + self.scraper.fingerprint_misses
+            print(
+                f"Unchanged product pages: {self.scraper.fingerprint_hits}/{n_pages}"
+                f" ({self.scraper.fingerprint_hits / max(n_pages, 1):.0%})."
+            )
+
+    def _take_distributed_snapshot(
+        self,
+        queue_file: str,
+        local_workers: int,
+        visibility_timeout: float,
+        poll_interval: float,
+    ) -> None:
+        """
+        Puts one job per product in the job queue, waits for the workers to process them and merges the results.
+        """
+        run_id = uuid.uuid4().hex
+        queue = JobQueue(queue_file)
+        queue.enqueue(
+            run_id,
+            list(enumerate(self.product_list.get_products())),
+        )
+
+        def start_worker() -> multiprocessing.Process:
+            # local workers stay alive until every job of the run is finished, even when the queue looks empty
+            # because other workers hold the last leases
+            process = multiprocessing.Process(
+                target=run_worker,
+                args=(queue_file,),
+                kwargs={
+                    "run_id": run_id,
+                    "visibility_timeout": visibility_timeout,
+                    "idle_timeout": None,
+                    "scraper_factory": Scraper,
+                    "verbose": self.verbose,
+                },
+            )
+            process.start()
+            return process
+
+        workers = [start_worker() for _ in range(local_workers)]
+
+        try:
+            while (n_left := queue.count_unfinished(run_id)) > 0:
+                if self.verbose:
+                    print(f"Waiting for {n_left} jobs.")
+                time.sleep(poll_interval)
+                queue.requeue_expired()
+                for index, worker in enumerate(workers):
+                    # a worker only exits normally once the run is finished
+                    if not worker.is_alive() and worker.exitcode != 0:
+                        if self.verbose:
+                            print(
+                                f"Restarting a local worker (exit code {worker.exitcode})."
+                            )
+                        workers[index] = start_worker()
+
+            deal_index = BestDealIndex.load_or_build(
+                self.product_list.filename, self.product_list
+            )
+            products = self.product_list.get_products()
+            n_hits, n_pages = 0, 0
+            for job, prices, error in queue.results(run_id):
+                if prices is not None:
+                    product = products[job.product_key]
+                    # the worker reused the fingerprint prices if the fingerprint did not change
+                    n_hits += (
+                        product.fingerprint != ""
+                        and len(product.fingerprint_prices) > 0
+                        and job.product["fingerprint"] == product.fingerprint
+                    )
+                    n_pages += 1
+                    product.set_snapshot_state(job.product)
+                    deal_index.update(product, product.add_prices(prices))
+                elif self.verbose:
+                    print(f"Prices not found for: {job.search_name}\n{error}")
+            self.product_list.save()
+            deal_index.save()
+            queue.purge(run_id)
+        finally:
+            for worker in workers:
+                worker.join()
+            queue.close()
         if self.verbose:
             print(self.product_list)
+            print(
+                f"Unchanged product pages: {n_hits}/{n_pages} ({n_hits / max(n_pages, 1):.0%})."
+            )
+
+    def crawl_catalogue(self, listing_urls: Iterable[str], max_pages: int = 50) -> None:
+        """
+        Records the prices displayed on listing pages (category, brand or search results) in one page load per page.
+        Tracked products get the displayed price and the products that are not tracked yet are registered.
+        Only the price of the variant displayed on each tile is known, a snapshot is still needed for the others.
+
+        Args:
+            listing_urls: The urls of the first page of each listing to walk.
+            max_pages: The maximum number of pages to walk per listing.
+        """
+        n_updated, n_registered = 0, 0
+        # blank urls, e.g. after a trailing ";", would make the browser fail once the first listings are crawled
+        for listing_url in (url.strip() for url in listing_urls if url.strip() != ""):
+            if self.verbose:
+                print(f"Crawling: {listing_url}")
+            for entry in self.scraper.crawl_listing(listing_url, max_pages):
+                if entry["product_name"] == "" or entry["brand"] == "":
+                    continue
+                # a price without a volume cannot be told apart from the other variants
+                prices = [entry["price"]] if entry["price"].volume > 0 else []
+                if (
+                    product := self.product_list.find_product(
+                        entry["product_name"], entry["description"], entry["brand"]
+                    )
+                ) is not None:
+                    product.add_prices(prices)
+                    product.url = product.url or entry["url"]
+                    n_updated += 1
+                else:
+                    self.product_list.add_product(
+                        ProductInfo(
+                            product_name=entry["product_name"],
+                            description=entry["description"],
+                            brand=entry["brand"],
+                            url=entry["url"],
+                            prices=prices,
+                        ),
+                        self.verbose,
+                    )
+                    n_registered += 1
+        self.product_list.save()
+        if self.verbose:
+            print(
+                f"Updated {n_updated} tracked products and registered {n_registered} new ones."
+            )
 
     def add_product(self, product_name: str) -> None:
         """
@@ -70,10 +298,83 @@ class NotinoScraper:
             )
             self.product_list.save()
 
+    def add_products(
+        self, product_names: Iterable[str], workers: int = 2, adaptive: bool = False
+    ) -> RegistrationReport:
+        """
+        Adds several products to the list of products. The names are deduplicated, then looked for concurrently
+        by several browsers, and the products found are merged into the list before saving it once.
+
+        Args:
+            product_names: The names of the products to add.
+            workers: The number of browsers used to look for the products.
+            adaptive: Whether the number of products looked for at the same time is adjusted between 1 and workers
+                according to the latency and the errors observed.
+
+        Returns:
+            A report of the names that were added, already tracked, not resolved or ambiguous.
+        """
+        product_names = normalize_product_names(product_names)
+        if len(product_names) == 0:
+            return RegistrationReport()
+
+        # each browser is used by one thread at a time, a new one is launched when they are all busy
+        idle_scrapers: "queue.SimpleQueue[Scraper]" = queue.SimpleQueue()
+        idle_scrapers.put(self.scraper)
+        controller = (
+            AdaptiveConcurrencyController(1, workers, verbose=self.verbose)
+            if adaptive
+            else None
+        )
+
+        def resolve(product_name: str) -> ProductInfo:
+            # the slot is held before picking a browser so that no browser is launched beyond the current limit
+            with controller.slot() if controller is not None else nullcontext():
+                try:
+                    scraper = idle_scrapers.get_nowait()
+                except queue.Empty:
+                    scraper = Scraper(
+                        headless=not self.debug_mode, search_cache=self.search_cache
+                    )
+                try:
+                    if self.verbose:
+                        print(f"Looking for: {product_name}")
+                    product_info = scraper.get_description(product_name)
+                    if controller is not None and scraper.is_blocked_page():
+                        raise BlockedPageException(scraper.web_driver.current_url)
+                    return product_info
+                finally:
+                    idle_scrapers.put(scraper)
+
+        report = RegistrationReport()
+        resolved: List[Tuple[str, ProductInfo]] = []
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(product_names)))
+        ) as executor:
+            futures = [(name, executor.submit(resolve, name)) for name in product_names]
+            for product_name, future in futures:
+                try:
+                    resolved.append((product_name, future.result()))
+                except ProductNotFoundException as e:
+                    report.unresolved.append((product_name, e.message))
+                except Exception:
+                    report.unresolved.append(
+                        (product_name, traceback.format_exc().strip().splitlines()[-1])
+                    )
+
+        merged = self.product_list.add_products(
+            [product_info for _, product_info in resolved]
+        )
+        for (product_name, _), (product, is_new) in zip(resolved, merged):
+            report.record_match(product_name, product, is_new)
+        self.product_list.save()
+        if self.verbose:
+            print(report)
+        return report
+
     def plot_evolution(self) -> None:
         """
         Plots the evolution of the prices of each product and stores the plots in the image folder.
-        FIXME: update in regard to new typing
         """
         while True:
             try:
@@ -92,44 +393,24 @@ class NotinoScraper:
 
         sns.set(color_codes=True)
 
-        y_min, y_max = (
-            min(
-                float(price["price"].replace(",", "."))
-                for product in self.product_list.products
-                for price in product.prices
-                if (
-                    price != "Info not found."
-                    and price["price"] != "Product not available."
-                    and price["price"] != "Price not found."
-                )
-            ),
-            max(
-                float(price["price"].replace(",", "."))
-                for product in self.product_list.products
-                for price in product.prices
-                if (
-                    price != "Info not found."
-                    and price["price"] != "Product not available."
-                    and price["price"] != "Price not found."
-                )
-            ),
-        )
+        available_prices = [
+            price["price"]
+            for product in self.product_list.products
+            for price in product.prices
+            if price["price"] is not None
+        ]
+        y_min, y_max = min(available_prices), max(available_prices)
         for product in self.product_list.products:
             # There can be different sizes for the same product.
             plots: DefaultDict[
                 str, DefaultDict[str, List[Tuple[datetime.date, float]]]
             ] = defaultdict(lambda: defaultdict(list))
             for price in product.prices:
-                if (
-                    price != "Info not found."
-                    and price["price"] != "Product not available."
-                    and price["price"] != "Price not found."
-                ):
-                    plots[f"{product.get_search_name()}"][f"{price['volume']}"].append(
-                        (
-                            datetime.date.fromisoformat(price["date"]),
-                            float(price["price"].replace(",", ".")),
-                        )
+                if price["price"] is not None:
+                    plots[f"{product.get_search_name()}"][
+                        f"{price['volume']} ml"
+                    ].append(
+                        (datetime.date.fromisoformat(price["date"]), price["price"])
                     )
             for product_name in plots:
                 # Removing the products that have too few prices recorded.
@@ -150,6 +431,73 @@ class NotinoScraper:
                     )
                     plt.close()
 
+    def print_search_cache_statistics(self) -> None:
+        """
+        Prints how many product searches were resolved by the search cache.
+        """
+        n_lookups = self.search_cache.hits + self.search_cache.misses
+        if n_lookups > 0:
+            print(
+                f"Search cache: {self.search_cache.hits} hits, {self.search_cache.misses} misses"
+                f" ({self.search_cache.hits / n_lookups:.0%} hit rate)."
+            )
+
+    def print_products(self, printer: ProductPrinter) -> None:
+        """
+        Prints the products recorded one after the other.
+
+        Args:
+            printer: The printer that holds the filters and the layout to use.
+        """
+        printer.print(self.product_list)
+
+    def export(self, filename: str, batch_size: int = 65536) -> None:
+        """
+        Exports the prices recorded to a csv, Parquet or Arrow file, one row per price.
+
+        Args:
+            filename: The path of the file to write, its extension sets the format.
+            batch_size: The number of rows written at once.
+        """
+        n_rows = export(self.product_list, filename, batch_size)
+        if self.verbose:
+            print(f"Exported {n_rows} prices to: {filename}")
+
+    def print_best_deals(self, n: int = 10) -> None:
+        """
+        Prints the (product, volume) with the lowest price per mL among the volumes found in the latest snapshot,
+        along with their rank within their brand and their category, and how far they are from their lowest price.
+        The index is only built from the whole history if it is missing or outdated.
+
+        Args:
+            n: The number of deals to print.
+        """
+        deal_index = BestDealIndex.load_or_build(
+            self.product_list.filename, self.product_list
+        )
+        print(
+            f"{'€/mL':>7} {'Price':>8} {'Volume':>7} {'Brand':<20} {'Name':<30} {'Category':<16}"
+            f" {'Brand rank':>10} {'Category rank':>13} {'vs min':>7} {'Date':<10}"
+        )
+        for entry, brand_rank, category_rank in deal_index.top(n):
+            print(
+                f"{entry.last_price_per_ml:>7.3f} {entry.last_price:>8.2f} {entry.volume_ml:>4} mL"
+                f" {entry.brand[:20]:<20} {entry.product[:30]:<30} {entry.category[:16]:<16}"
+                f" {brand_rank:>10} {category_rank:>13} {entry.distance_from_min:>+7.0%} {entry.last_date:<10}"
+            )
+
+    def build_dashboard(self, filename: str, n_points: int = 300) -> None:
+        """
+        Writes a self-contained HTML report with an interactive chart of the prices of every product.
+
+        Args:
+            filename: The path of the HTML file to write.
+            n_points: The number of points each series is downsampled to before zooming in.
+        """
+        n_charts = write_dashboard(self.product_list, filename, n_points)
+        if self.verbose:
+            print(f"Wrote {n_charts} charts to: {filename}")
+
     def get_price(self, search_name: str) -> None:
         """
         Prints the current price of a product.
@@ -158,4 +506,5 @@ class NotinoScraper:
         Args:
             search_name: The name of the product to search for.
         """
-        print(Product(self.scraper.fetch_product_info(search_name)))
+        if search_name.strip() != "":
+            print(Product(self.scraper.fetch_product_info(search_name)))
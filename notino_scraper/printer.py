@@ -0,0 +1,146 @@
+import heapq
+import html
+import sys
+from typing import Any, Iterator, Optional, TextIO, Tuple
+
+from .data_structures import PriceSeries, Product, ProductList
+
+
+class ProductPrinter:
+    """
+    Prints a list of products one product at a time, so that the output starts right away and the memory used does not
+    depend on the length of the price history.
+    """
+
+    SUMMARIES = ("last", "min", "max")
+
+    def __init__(
+        self,
+        stream: TextIO = sys.stdout,
+        brand: str = "",
+        name: str = "",
+        since: str = "",
+        until: str = "",
+        summary: str = "",
+        table: bool = False,
+    ) -> None:
+        """
+        Sets up the filters and the layout.
+
+        Args:
+            stream: Where to write.
+            brand: Only prints the products of this brand (case-insensitive) if not empty.
+            name: Only prints the products whose name contains this string (case-insensitive) if not empty.
+            since: Only prints the prices recorded on this date (YYYY-MM-DD) or later if not empty.
+            until: Only prints the prices recorded on this date (YYYY-MM-DD) or before if not empty.
+            summary: Prints a single price per volume instead of the whole history: one of "last", "min" or "max".
+            table: Prints one line per price (or per volume with a summary) instead of one block per product.
+        """
+        assert (
+            summary == "" or summary in self.SUMMARIES
+        ), f"Unknown summary: {summary}."
+        self.stream = stream
+        self.brand = brand.lower()
+        self.name = name.lower()
+        self.since = since
+        self.until = until
+        self.summary = summary
+        self.table = table
+
+    def matches(self, product: Product) -> bool:
+        return (
+            self.brand == "" or html.unescape(product.brand).lower() == self.brand
+        ) and (
+            self.name == "" or self.name in html.unescape(product.product_name).lower()
+        )
+
+    def _series_items(self, series: PriceSeries) -> Iterator[Tuple[str, Any]]:
+        for price, price_date in series.items():
+            if self.until != "" and price_date > self.until:
+                break
+            if self.since == "" or price_date >= self.since:
+                yield price_date, price
+
+    def _summarize(self, series: PriceSeries) -> Optional[Tuple[str, Any]]:
+        items = self._series_items(series)
+        if self.summary == "last":
+            return max(items, default=None, key=lambda item: item[0])
+        available = (
+            (price_date, price) for price_date, price in items if price is not None
+        )
+        if self.summary == "min":
+            return min(available, default=None, key=lambda item: item[1])
+        return max(available, default=None, key=lambda item: item[1])
+
+    def _rows(self, product: Product) -> Iterator[Tuple[Any, str, Any]]:
+        """
+        Lists the prices to print for a product.
+
+        Yields:
+            The volume, date and price of each row, in chronological order unless summarized.
+        """
+        if self.summary != "":
+            for series in product.series.values():
+                if (item := self._summarize(series)) is not None:
+                    yield series.volume, item[0], item[1]
+        else:
+            # the series are merged by date, ties keeping the order of the series
+            yield from heapq.merge(
+                *(self._series_rows(series) for series in product.series.values()),
+                key=lambda row: row[1],
+            )
+
+    def _series_rows(self, series: PriceSeries) -> Iterator[Tuple[Any, str, Any]]:
+        for price_date, price in self._series_items(series):
+            yield series.volume, price_date, price
+
+    def _write_block(self, product: Product) -> None:
+        self.stream.write(
+            f"Name: {product.product_name}\nBrand: {product.brand}\nDescription: {product.description}\n"
+        )
+        n_rows = 0
+        for volume, price_date, price in self._rows(product):
+            if n_rows == 0:
+                self.stream.write("Prices recorded:\n")
+            record = {"price": price, "volume": volume, "date": price_date}
+            self.stream.write(f"\t{record!r}\n")
+            n_rows += 1
+        if n_rows == 0:
+            self.stream.write("No price recorded.\n")
+        self.stream.write("\n")
+
+    def _write_table_rows(self, product: Product) -> None:
+        brand, product_name = html.unescape(product.brand), html.unescape(
+            product.product_name
+        )
+        for volume, price_date, price in self._rows(product):
+            self.stream.write(
+                f"{brand[:20]:<20} {product_name[:30]:<30} {str(volume):>8} {price_date:<10} {str(price):>10}\n"
+            )
+
+    def print(self, product_list: ProductList) -> int:
+        """
+        Prints the products that match the filters.
+
+        Args:
+            product_list: The products to print.
+
+        Returns:
+            The number of products printed.
+        """
+        if self.table:
+            self.stream.write(
+                f"{'Brand':<20} {'Name':<30} {'Volume':>8} {'Date':<10} {'Price':>10}\n"
+            )
+        n_products = 0
+        for product in product_list.get_products():
+            if not self.matches(product):
+                continue
+            if self.table:
+                self._write_table_rows(product)
+            else:
+                self._write_block(product)
+            self.stream.flush()
+            n_products += 1
+        self.stream.write(f"Found prices for {n_products} products.\n")
+        return n_products
@@ -0,0 +1,99 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import DefaultDict, Dict, Iterable, List, Tuple
+
+from .data_structures import Product
+from .scraper import SearchCache
+
+
+def normalize_product_names(product_names: Iterable[str]) -> List[str]:
+    """
+    Cleans up the names of products to look for and drops the duplicates, two names being duplicates if they only
+    differ in case, accents, punctuation, spacing or word order.
+
+    Args:
+        product_names: The names as typed by the user.
+
+    Returns:
+        The names left, in their original order.
+    """
+    names: Dict[str, str] = {}
+    for product_name in product_names:
+        product_name = re.sub(r"\s+", " ", product_name).strip()
+        if product_name != "":
+            names.setdefault(SearchCache.normalize_query(product_name), product_name)
+    return list(names.values())
+
+
+def read_product_names(filename: str) -> List[str]:
+    """
+    Reads the names of products to look for from a text file, one name per line.
+    Empty lines and lines starting with # are ignored.
+
+    Args:
+        filename: The path to the text file.
+
+    Returns:
+        The names read.
+    """
+    with open(filename, encoding="utf-8") as names_file:
+        return [
+            line
+            for line in names_file.read().splitlines()
+            if not line.lstrip().startswith("#")
+        ]
+
+
+@dataclass
+class RegistrationReport:
+    added: List[str] = field(default_factory=list)
+    """
+    Names that led to a product that was not tracked yet.
+    """
+    already_tracked: List[str] = field(default_factory=list)
+    """
+    Names that led to a product that was already tracked.
+    """
+    unresolved: List[Tuple[str, str]] = field(default_factory=list)
+    """
+    Names that did not lead to any product, along with the reason.
+    """
+    matches: DefaultDict[str, List[str]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    """
+    Names that were resolved, grouped by the search name of the product found.
+    """
+
+    @property
+    def ambiguous(self) -> Dict[str, List[str]]:
+        """
+        Products that were found for several distinct names, which may not all refer to the same product.
+        """
+        return {
+            product: names for product, names in self.matches.items() if len(names) > 1
+        }
+
+    def record_match(self, product_name: str, product: Product, is_new: bool) -> None:
+        (self.added if is_new else self.already_tracked).append(product_name)
+        self.matches[product.get_search_name()].append(product_name)
+
+    def __repr__(self) -> str:
+        lines = [
+            f"Added {len(self.added)} products, {len(self.already_tracked)} were already tracked, "
+            f"{len(self.unresolved)} names were not resolved."
+        ]
+        if self.unresolved:
+            lines.append("Unresolved names:")
+            lines.extend(
+                f"\t{product_name}: {reason}"
+                for product_name, reason in self.unresolved
+            )
+        if ambiguous := self.ambiguous:
+            lines.append("Names that led to the same product:")
+            lines.extend(
+                f"\t{product}: {'; '.join(names)}"
+                for product, names in ambiguous.items()
+            )
+        return "\n".join(lines)
@@ -1 +1,4 @@
 from .scraper import Scraper
+from .search_cache import SearchCache, SearchResult
+from .tab_pipeline import TabPipeline
+from .concurrency import AdaptiveConcurrencyController
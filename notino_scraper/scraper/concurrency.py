@@ -0,0 +1,193 @@
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException
+
+from notino_scraper.data_structures import (
+    BlockedPageException,
+    ProductNotFoundException,
+    SearchTimeoutException,
+)
+
+
+class AdaptiveConcurrencyController:
+    """
+    Adjusts the number of requests in flight to the website with an AIMD policy (additive increase, multiplicative
+    decrease): the limit grows by a constant after each window of requests that went well, and is cut by a factor
+    as soon as requests time out, get blocked, fail too often or get slower than the latency target.
+    """
+
+    SUCCESS, TIMEOUT, ERROR, BLOCKED = "success", "timeout", "error", "blocked"
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        initial_limit: Optional[int] = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        window: int = 10,
+        max_error_rate: float = 0.2,
+        latency_target: Optional[float] = None,
+        verbose: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            min_limit: The lowest number of requests in flight.
+            max_limit: The highest number of requests in flight.
+            initial_limit: The number of requests in flight to start with, defaults to min_limit.
+            increase: What is added to the limit after a window of requests that went well.
+            decrease: The factor the limit is multiplied by when the website shows signs of overload.
+            window: The number of requests between two decisions.
+            max_error_rate: The share of failed requests in a window above which the limit is decreased.
+            latency_target: The median latency above which the limit is decreased, in seconds. None disables it.
+            verbose: Whether the decisions are printed.
+            clock: The clock used to measure the throughput.
+        """
+        assert 1 <= min_limit <= max_limit, "Invalid concurrency bounds."
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial_limit if initial_limit is not None else min_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.latency_target = latency_target
+        self.verbose = verbose
+        self.clock = clock
+
+        self.in_flight = 0
+        self.n_completed = 0
+        self.decisions: List[Tuple[float, int, int, str]] = []
+        """
+        Time, previous limit, new limit and reason of each change of the limit.
+        """
+        self._samples: List[Tuple[float, str]] = []
+        self._window_start = clock()
+        self._completed_at_decrease, self._in_flight_at_decrease = 0, 0
+        self._condition = threading.Condition()
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, min(self.max_limit, int(self.limit)))
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until a request can be sent without exceeding the limit.
+
+        Args:
+            timeout: How long to wait at most, in seconds. None means waiting as long as needed.
+
+        Returns:
+            True if the request can be sent, False if the timeout expired.
+        """
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self.in_flight < self.current_limit, timeout
+            ):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, outcome: str) -> None:
+        """
+        Records the outcome of a request sent after acquire and frees its slot.
+
+        Args:
+            latency: The time the request took, in seconds.
+            outcome: One of SUCCESS, TIMEOUT, ERROR or BLOCKED.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self._record(latency, outcome)
+            self._condition.notify_all()
+
+    def record(self, latency: float, outcome: str, in_flight: int) -> None:
+        """
+        Records the outcome of a request for callers that bound the requests in flight with current_limit themselves.
+
+        Args:
+            latency: The time the request took, in seconds.
+            outcome: One of SUCCESS, TIMEOUT, ERROR or BLOCKED.
+            in_flight: The number of requests of the caller still in flight once this one completed.
+        """
+        with self._condition:
+            self.in_flight = in_flight
+            self._record(latency, outcome)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """
+        Holds a slot for the duration of a request and classifies its outcome from the exception raised, if any.
+        A product that is not found is a valid answer of the website and counts as a success, unless the search timed out.
+        """
+        self.acquire()
+        start, outcome = self.clock(), self.SUCCESS
+        try:
+            yield
+        except (TimeoutException, TimeoutError, SearchTimeoutException):
+            outcome = self.TIMEOUT
+            raise
+        except ProductNotFoundException:
+            raise
+        except BlockedPageException:
+            outcome = self.BLOCKED
+            raise
+        except Exception:
+            outcome = self.ERROR
+            raise
+        finally:
+            self.release(self.clock() - start, outcome)
+
+    def _record(self, latency: float, outcome: str) -> None:
+        self.n_completed += 1
+        self._samples.append((latency, outcome))
+        # timeouts and blocked pages are the clearest signs of throttling and are acted upon right away,
+        # except for the requests that were already in flight when the limit was last decreased
+        if outcome in (self.TIMEOUT, self.BLOCKED):
+            if (
+                self.n_completed - self._completed_at_decrease
+                > self._in_flight_at_decrease
+            ):
+                self._adjust(self.limit * self.decrease, f"{outcome} received")
+        elif len(self._samples) >= self.window:
+            error_rate = sum(
+                sample[1] != self.SUCCESS for sample in self._samples
+            ) / len(self._samples)
+            median_latency = statistics.median(sample[0] for sample in self._samples)
+            if error_rate > self.max_error_rate:
+                self._adjust(self.limit * self.decrease, f"error rate {error_rate:.0%}")
+            elif (
+                self.latency_target is not None and median_latency > self.latency_target
+            ):
+                self._adjust(
+                    self.limit * self.decrease, f"median latency {median_latency:.2f} s"
+                )
+            else:
+                self._adjust(self.limit + self.increase, "window without errors")
+
+    def _adjust(self, new_limit: float, reason: str) -> None:
+        now = self.clock()
+        n_samples = len(self._samples)
+        throughput = n_samples / max(now - self._window_start, 1e-9)
+        median_latency = statistics.median(sample[0] for sample in self._samples)
+        previous_limit = self.current_limit
+        if new_limit < self.limit:
+            self._completed_at_decrease, self._in_flight_at_decrease = (
+                self.n_completed,
+                self.in_flight,
+            )
+        self.limit = max(float(self.min_limit), min(float(self.max_limit), new_limit))
+        self.decisions.append((now, previous_limit, self.current_limit, reason))
+        if self.verbose:
+            print(
+                f"Concurrency {previous_limit} -> {self.current_limit} ({reason}): "
+                f"{throughput:.2f} requests/s, median latency {median_latency:.2f} s over {n_samples} requests."
+            )
+        self._samples = []
+        self._window_start = now
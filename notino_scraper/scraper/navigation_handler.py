@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, List, Optional, Tuple
 
 from selenium.common.exceptions import (
     InvalidSelectorException,
@@ -10,16 +10,24 @@ from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.firefox.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 
-from notino_scraper.data_structures.product_not_found import ProductNotFoundException
+from notino_scraper.data_structures.product_not_found import (
+    ProductNotFoundException,
+    SearchTimeoutException,
+)
+from .search_cache import SearchCache, SearchResult
 from .utils import result_match
 from .web_driver_wrapper import WebDriverWrapper
 
 
 class NavigationHandler(WebDriverWrapper):
-    def __init__(self, url: str, headless: bool):
+    def __init__(
+        self, url: str, headless: bool, search_cache: Optional[SearchCache] = None
+    ):
         super().__init__(url, headless)
+        self.search_cache = search_cache
 
     @staticmethod
     def search_finalized(product_name: str) -> Callable[[WebDriver], bool]:
@@ -57,20 +65,29 @@ class NavigationHandler(WebDriverWrapper):
 
         return _predicate
 
-    def find_product_url_in_right_suggestion_column(self, product_name: str) -> str:
+    def find_product_url_in_right_suggestion_column(
+        self, product_name: str
+    ) -> Tuple[str, str]:
         WebDriverWait(self.web_driver, 3).until(self.search_finalized(product_name))
 
+        suggestion = self.web_driver.find_element(
+            By.CSS_SELECTOR, "div[id='header-suggestProductCol']"
+        ).find_elements(By.CSS_SELECTOR, "a[id='header-productWrapper']")[0]
         return (
-            self.web_driver.find_element(
-                By.CSS_SELECTOR, "div[id='header-suggestProductCol']"
-            )
-            .find_elements(By.CSS_SELECTOR, "a[id='header-productWrapper']")[0]
-            .get_attribute("href")
+            suggestion.get_attribute("href"),
+            suggestion.find_element(By.CSS_SELECTOR, "div span").get_attribute(
+                "innerHTML"
+            ),
         )
 
-    def find_product_url_in_left_suggestion_column(self, product_name: str) -> str:
+    def find_product_url_in_left_suggestion_column(
+        self, product_name: str
+    ) -> Tuple[str, str]:
         """
         Finds the first suggestion in the suggestion section if it matches the product_name.
+
+        Returns:
+            The url and the title of the suggestion.
         """
         # taking the first suggestion in the column assuming the search results are already ordered by similarity
         suggestion = self.web_driver.find_element(
@@ -81,13 +98,15 @@ class NavigationHandler(WebDriverWrapper):
         if (span := suggestion.find_elements(By.TAG_NAME, "span")) and result_match(
             span[0].get_attribute("innerHTML"), product_name
         ):
-            return span[0].get_attribute("href")
+            return span[0].get_attribute("href"), span[0].get_attribute("innerHTML")
         elif result_match(suggestion.get_attribute("innerHTML"), product_name):
-            return suggestion.get_attribute("href")
+            return suggestion.get_attribute("href"), suggestion.get_attribute(
+                "innerHTML"
+            )
 
         raise ProductNotFoundException(product_name)
 
-    def find_product_url_in_search_results(self, product_name: str) -> str:
+    def find_product_url_in_search_results(self, product_name: str) -> Tuple[str, str]:
         try:
             WebDriverWait(self.web_driver, 3).until(
                 lambda x: x.find_element(
@@ -95,23 +114,67 @@ class NavigationHandler(WebDriverWrapper):
                 )
             )
             return next(
-                container.get_attribute("href")
+                (container.get_attribute("href"), title)
                 for container in self.web_driver.find_elements(
                     By.CSS_SELECTOR, "[data-testid='product-container']"
                 )
                 if result_match(
-                    container.find_element(By.TAG_NAME, "h3").get_attribute(
+                    title := container.find_element(By.TAG_NAME, "h3").get_attribute(
                         "innerHTML"
                     ),
                     product_name,
                 )
             )
-        except (StopIteration, TimeoutException):
+        except StopIteration:
             raise ProductNotFoundException(product_name)
+        except TimeoutException:
+            # the page may just be slow, this is not a definitive answer
+            raise SearchTimeoutException(product_name)
 
-    def navigate_to_product_page(self, product_name: str) -> None:
+    def get_listing_tiles(self) -> List[WebElement]:
+        """
+        Waits for the product tiles of a listing page (category, brand or search results) to be displayed.
+
+        Returns:
+            The product tiles of the current page, an empty list if there is none.
         """
+        try:
+            WebDriverWait(self.web_driver, 3).until(
+                lambda x: x.find_element(
+                    By.CSS_SELECTOR, "[data-testid='product-container']"
+                )
+            )
+        except TimeoutException:
+            return []
+        return self.web_driver.find_elements(
+            By.CSS_SELECTOR, "[data-testid='product-container']"
+        )
+
+    def find_next_listing_page(self) -> Optional[str]:
+        """
+        Finds the url of the next page of the listing currently displayed.
+
+        Returns:
+            The url of the next page, None if the current page is the last one.
+        """
+        for css_selector in ("link[rel='next']", "a[rel='next']"):
+            if (
+                links := self.web_driver.find_elements(By.CSS_SELECTOR, css_selector)
+            ) and (href := links[0].get_attribute("href")):
+                return href
+        return None
+
+    def resolve_product_url(self, product_name: str) -> SearchResult:
+        """
+        Types the name of a product in the search bar and finds the url of the product page among the suggestions,
+        or among the search results if no suggestion matches.
         FIXME: fix case where the brand page can be found in left suggestion column and opened.
+
+        Args:
+            product_name: The content put in the search bar.
+
+        Returns:
+            The url of the product page, the title that matched and where it was found.
         """
         search_bar = self.web_driver.find_element(
             By.CSS_SELECTOR, "[id='pageHeader'] input"
@@ -119,15 +182,19 @@ class NavigationHandler(WebDriverWrapper):
         search_bar.send_keys(product_name)
 
         try:
-            self.web_driver.get(
-                self.find_product_url_in_right_suggestion_column(product_name)
+            return SearchResult(
+                *self.find_product_url_in_right_suggestion_column(product_name),
+                strategy="right suggestion column",
             )
-
         except TimeoutException:
             try:
-                self.web_driver.get(
-                    self.find_product_url_in_left_suggestion_column(product_name)
+                url, title = self.find_product_url_in_left_suggestion_column(
+                    product_name
                 )
+                # the span elements of the column may not hold any url
+                if not url:
+                    raise InvalidArgumentException(url)
+                return SearchResult(url, title, strategy="left suggestion column")
             # catching NoSuchElementException in case the left suggestion column is missing
             except (
                 TimeoutException,
@@ -137,9 +204,39 @@ class NavigationHandler(WebDriverWrapper):
             ):
                 # pressing enter to display the search results
                 search_bar.send_keys(Keys.ENTER)
-                try:
-                    self.web_driver.get(
-                        self.find_product_url_in_search_results(product_name)
-                    )
-                except InvalidArgumentException:
-                    raise ProductNotFoundException
+                return SearchResult(
+                    *self.find_product_url_in_search_results(product_name),
+                    strategy="search results",
+                )
+
+    def navigate_to_product_page(self, product_name: str) -> None:
+        """
+        Opens the page of a product, using the search cache if any to skip the search bar.
+
+        Args:
+            product_name: The content to put in the search bar.
+        """
+        result = (
+            self.search_cache.get(product_name)
+            if self.search_cache is not None
+            else None
+        )
+        if result is None:
+            try:
+                result = self.resolve_product_url(product_name)
+            except SearchTimeoutException:
+                raise
+            except ProductNotFoundException:
+                # only a search whose results do not match is remembered
+                if self.search_cache is not None:
+                    self.search_cache.put_not_found(product_name)
+                raise
+            if self.search_cache is not None:
+                self.search_cache.put(product_name, result)
+        if result.url == "":
+            raise ProductNotFoundException(product_name)
+
+        try:
+            self.web_driver.get(result.url)
+        except InvalidArgumentException:
+            raise ProductNotFoundException(product_name)
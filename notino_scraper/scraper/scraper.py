@@ -1,23 +1,39 @@
 import datetime
+import hashlib
 import traceback
-from typing import Optional, List
+from typing import Iterator, Optional, List
 
 from selenium.common.exceptions import NoSuchElementException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
 from notino_scraper.data_structures import (
+    ListingEntry,
+    Product,
     ProductInfo,
     ProductPrice,
     ProductPriceNotFoundException,
 )
 from .navigation_handler import NavigationHandler
-from .utils import format_info, get_volume_from_content
+from .search_cache import SearchCache
+from .utils import (
+    find_price_in_content,
+    find_volume_in_content,
+    format_info,
+    get_volume_from_content,
+)
 
 
 class Scraper(NavigationHandler):
-    def __init__(self, url: str = "notino.fr", headless: bool = True):
-        super().__init__(url, headless)
+    def __init__(
+        self,
+        url: str = "notino.fr",
+        headless: bool = True,
+        search_cache: Optional[SearchCache] = None,
+    ):
+        super().__init__(url, headless, search_cache)
+        self.fingerprint_hits = 0
+        self.fingerprint_misses = 0
 
     def _single_selector_reader(self, css_selector: str, attribute: str) -> str:
         try:
@@ -86,6 +102,35 @@ class Scraper(NavigationHandler):
             and unavailable_spans[0].get_attribute("innerHTML") == unavailable_message
         )
 
+    def is_blocked_page(self) -> bool:
+        """
+        Checks if the current page is an error page served instead of the content requested,
+        e.g. when too many requests were sent.
+
+        Returns:
+            True if the page is blocked, False otherwise.
+        """
+        blocked_messages = (
+            "access denied",
+            "too many requests",
+            "captcha",
+            "request blocked",
+        )
+        title = (self.web_driver.title or "").lower()
+        return any(message in title for message in blocked_messages) or (
+            len(
+                self.web_driver.find_elements(
+                    By.CSS_SELECTOR, "[id=pdHeader], [id=pageHeader]"
+                )
+            )
+            == 0
+            and any(
+                message
+                in self.web_driver.find_element(By.TAG_NAME, "body").text.lower()
+                for message in blocked_messages
+            )
+        )
+
     def deal_with_cookie_modal(self) -> None:
         try:
             self.web_driver.find_element(
@@ -95,23 +140,94 @@ class Scraper(NavigationHandler):
             pass
 
     def _find_prices(self) -> List[ProductPrice]:
+        # the default date of ProductPrice is the one the module was imported on, stale in long-running processes
+        today = datetime.date.today().isoformat()
         try:
             return [
                 ProductPrice(
                     price=self._read_variant_price(variant),
                     volume=self._get_variant_volume(variant),
+                    date=today,
                 )
                 for variant in self._get_variants()
             ]
         except NoSuchElementException:
             try:
                 return [self._get_selected_variant_info()]
-            except NoSuchElementException:
+            # a missing price is read as "Info not found", which float cannot parse
+            except (NoSuchElementException, ValueError):
                 print(traceback.format_exc())
                 if not self._is_product_available():
-                    return [ProductPrice()]
+                    return [ProductPrice(date=today)]
                 else:
-                    raise ProductPriceNotFoundException
+                    raise ProductPriceNotFoundException(self.web_driver.current_url)
+
+    def _fingerprint_prices_section(self) -> str:
+        """
+        Hashes the part of the product page the prices are extracted from.
+
+        Returns:
+            The fingerprint of the section, an empty string if it could not be found.
+        """
+        sections = [
+            element.get_attribute("outerHTML")
+            for css_selector in (
+                "[id=pdVariantsTile]",
+                "[id=pdSelectedVariant]",
+                "[id=pd-price]",
+            )
+            for element in self.web_driver.find_elements(By.CSS_SELECTOR, css_selector)
+        ]
+        if len(sections) == 0:
+            return ""
+        return hashlib.sha256("".join(sections).encode()).hexdigest()
+
+    def snapshot_product(self, product: Product) -> List[ProductPrice]:
+        """
+        Finds the prices of a tracked product, opening its page directly if its url is known.
+        The prices are only extracted again if the prices section of the page changed since the last snapshot,
+        otherwise the prices extracted along with the fingerprint are reused with the current date.
+        The url and the fingerprint of the product are updated.
+
+        Args:
+            product: The product to look into.
+
+        Returns:
+            The prices of each volume as of the current date.
+        """
+        self.deal_with_cookie_modal()
+        if product.url != "":
+            self.web_driver.get(product.url)
+        else:
+            self.navigate_to_product_page(product.get_search_name())
+            product.url = self.web_driver.current_url
+
+        return self.read_snapshot_prices(product)
+
+    def read_snapshot_prices(self, product: Product) -> List[ProductPrice]:
+        """
+        Reads the prices of a tracked product on its page, which is assumed to be the current one.
+        The prices are only extracted again if the prices section of the page changed since the last snapshot,
+        otherwise the prices extracted along with the fingerprint are reused with the current date.
+        The fingerprint of the product is updated.
+
+        Args:
+            product: The product whose page is displayed.
+
+        Returns:
+            The prices of each volume as of the current date.
+        """
+        fingerprint = self._fingerprint_prices_section()
+        today = datetime.date.today().isoformat()
+        if fingerprint != "" and fingerprint == product.fingerprint:
+            if len(prices := product.get_fingerprint_prices(today)) > 0:
+                self.fingerprint_hits += 1
+                return prices
+
+        self.fingerprint_misses += 1
+        prices = self._find_prices()
+        product.set_fingerprint(fingerprint, prices)
+        return prices
 
     def fetch_product_info(
         self, product_name: str, get_prices: bool = True
@@ -136,9 +252,8 @@ class Scraper(NavigationHandler):
             description=self._single_selector_reader(
                 "div[id='pdHeader'] h1 span + span", "innerHTML"
             ),
-            brand=self._single_selector_reader(
-                "div[id='pdHeader'] h1 a", "innerHTML"
-            ),
+            brand=self._single_selector_reader("div[id='pdHeader'] h1 a", "innerHTML"),
+            url=self.web_driver.current_url,
             prices=self._find_prices() if get_prices else [],
         )
 
@@ -168,3 +283,64 @@ class Scraper(NavigationHandler):
         self.navigate_to_product_page(product_name)
 
         return self._find_prices()
+
+    @staticmethod
+    def _read_tile_text(tile: WebElement, css_selector: str) -> str:
+        try:
+            return format_info(
+                tile.find_element(By.CSS_SELECTOR, css_selector).get_attribute(
+                    "textContent"
+                )
+            )
+        except NoSuchElementException:
+            return ""
+
+    def _read_listing_tile(self, tile: WebElement) -> ListingEntry:
+        """
+        Extracts the information displayed on a product tile of a listing page.
+
+        Args:
+            tile: The tile to read.
+
+        Returns:
+            The name, description, brand, url and displayed price of the product.
+        """
+        return ListingEntry(
+            product_name=self._read_tile_text(tile, "h3"),
+            description=self._read_tile_text(tile, "p"),
+            brand=self._read_tile_text(tile, "h2"),
+            url=tile.get_attribute("href"),
+            price=ProductPrice(
+                price=find_price_in_content(
+                    self._read_tile_text(tile, "[data-testid='price-component']")
+                ),
+                volume=find_volume_in_content(tile.get_attribute("textContent")),
+                date=datetime.date.today().isoformat(),
+            ),
+        )
+
+    def crawl_listing(self, url: str, max_pages: int = 50) -> Iterator[ListingEntry]:
+        """
+        Walks a listing page (category, brand or search results) and its following pages.
+        A single page load yields the displayed price of every product on the page.
+
+        Args:
+            url: The url of the first page of the listing.
+            max_pages: The maximum number of pages to walk.
+
+        Yields:
+            The information displayed on each product tile.
+        """
+        visited = set()
+        next_url: Optional[str] = url
+        while (
+            next_url is not None
+            and next_url not in visited
+            and len(visited) < max_pages
+        ):
+            visited.add(next_url)
+            self.web_driver.get(next_url)
+            self.deal_with_cookie_modal()
+            for tile in self.get_listing_tiles():
+                yield self._read_listing_tile(tile)
+            next_url = self.find_next_listing_page()
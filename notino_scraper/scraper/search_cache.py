@@ -0,0 +1,155 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass
+class SearchResult:
+    url: str
+    """
+    Url of the product page. It is empty if the product was not found.
+    """
+    title: str = ""
+    """
+    Title of the search result that matched the query.
+    """
+    strategy: str = ""
+    """
+    Where the result was found: right or left suggestion column, or search results page.
+    """
+
+
+class SearchCache:
+    """
+    Caches the resolution of search queries into product urls,
+    so that repeated lookups do not go through the search bar.
+    An in-memory LRU sits in front of a SQLite file that persists the results from one run to the next.
+    Queries that did not match any product are cached as well, with a shorter time to live.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        ttl: float = 7 * 24 * 3600,
+        negative_ttl: float = 24 * 3600,
+        max_memory_entries: int = 1024,
+    ) -> None:
+        """
+        Opens the cache stored in filename and creates it if it does not exist yet.
+
+        Args:
+            filename: The path to the SQLite file.
+            ttl: How long a product url is kept, in seconds.
+            negative_ttl: How long a query that did not match any product is kept, in seconds.
+            max_memory_entries: The number of entries kept in memory.
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_memory_entries = max_memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[SearchResult, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_results (
+                    query TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    strategy TEXT NOT NULL,
+                    created REAL NOT NULL
+                )
+                """
+            )
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """
+        Normalises a query so that near-duplicates share the same entry: case, accents, punctuation,
+        spacing and word order are ignored.
+
+        Args:
+            query: The text put in the search bar.
+
+        Returns:
+            The key of the query in the cache.
+        """
+        query = unicodedata.normalize("NFKD", query.replace("&amp;", "&"))
+        query = "".join(
+            char for char in query if not unicodedata.combining(char)
+        ).lower()
+        return " ".join(sorted(re.sub(r"[^\w&]+", " ", query).split()))
+
+    def _is_fresh(self, result: SearchResult, created: float) -> bool:
+        return time.time() - created <= (
+            self.ttl if result.url != "" else self.negative_ttl
+        )
+
+    def _remember(self, key: str, result: SearchResult, created: float) -> None:
+        self._memory[key] = (result, created)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, query: str) -> Optional[SearchResult]:
+        """
+        Looks for the result of a query.
+
+        Args:
+            query: The text put in the search bar.
+
+        Returns:
+            The result if it is cached and fresh (its url is empty if no product matched), None otherwise.
+        """
+        key = self.normalize_query(query)
+        with self._lock:
+            if key in self._memory:
+                result, created = self._memory[key]
+            elif (
+                row := self.connection.execute(
+                    "SELECT url, title, strategy, created FROM search_results WHERE query = ?",
+                    (key,),
+                ).fetchone()
+            ) is not None:
+                result, created = SearchResult(*row[:3]), row[3]
+            else:
+                self.misses += 1
+                return None
+
+            if not self._is_fresh(result, created):
+                self._memory.pop(key, None)
+                self.misses += 1
+                return None
+            self._remember(key, result, created)
+            self.hits += 1
+            return result
+
+    def put(self, query: str, result: SearchResult) -> None:
+        """
+        Stores the result of a query.
+
+        Args:
+            query: The text put in the search bar.
+            result: The product page found, with an empty url if no product matched.
+        """
+        key, created = self.normalize_query(query), time.time()
+        with self._lock:
+            self._remember(key, result, created)
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?, ?)",
+                    (key, result.url, result.title, result.strategy, created),
+                )
+
+    def put_not_found(self, query: str) -> None:
+        self.put(query, SearchResult(url=""))
+
+    def close(self) -> None:
+        self.connection.close()
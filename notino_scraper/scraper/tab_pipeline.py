@@ -0,0 +1,202 @@
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from notino_scraper.data_structures import BlockedPageException, Product, ProductPrice
+from .concurrency import AdaptiveConcurrencyController
+from .scraper import Scraper
+
+
+@dataclass
+class TabStatistics:
+    n_pages: int = 0
+    loading_time: float = 0.0
+    """
+    Time spent between starting the navigation and finding the page loaded, in seconds.
+    """
+    extraction_time: float = 0.0
+    """
+    Time spent reading the prices once the page was loaded, in seconds.
+    """
+    n_errors: int = 0
+
+    def __repr__(self) -> str:
+        n_pages = max(self.n_pages, 1)
+        return (
+            f"{self.n_pages} pages, {self.n_errors} errors, "
+            f"{self.loading_time / n_pages:.2f} s loading and "
+            f"{self.extraction_time / n_pages:.2f} s extracting per page"
+        )
+
+
+class TabPipeline:
+    """
+    Loads several product pages at once in the tabs of a single browser.
+    Navigations are started without waiting for them to finish, and the prices are read from whichever tab
+    finishes loading first, which then moves on to the next product. Network waits overlap while the memory used
+    stays the one of a single browser.
+    """
+
+    STALE_MARKER = "notinoStale"
+    """
+    Data attribute set on the page a tab leaves, to tell it apart from the page it is navigating to.
+    """
+
+    def __init__(
+        self,
+        scraper: Scraper,
+        n_tabs: int,
+        page_timeout: float = 30.0,
+        poll_interval: float = 0.05,
+        controller: Optional[AdaptiveConcurrencyController] = None,
+    ) -> None:
+        """
+        Args:
+            scraper: The Scraper whose browser will hold the tabs.
+            n_tabs: The number of tabs loading pages at the same time.
+            page_timeout: How long a page can take to load before giving up, in seconds.
+            poll_interval: How long to wait when no tab has finished loading, in seconds.
+            controller: If given, sets how many of the tabs load pages at the same time
+                according to the latency and the errors observed.
+        """
+        self.scraper = scraper
+        self.web_driver = scraper.web_driver
+        self.controller = controller
+        self.n_tabs = max(1, n_tabs)
+        self.page_timeout = page_timeout
+        self.poll_interval = poll_interval
+        self.statistics: Dict[str, TabStatistics] = {}
+
+    def _limit(self, n_handles: int) -> int:
+        if self.controller is None:
+            return n_handles
+        return self.controller.current_limit
+
+    def _start_navigation(self, handle: str, url: str) -> None:
+        try:
+            self.web_driver.switch_to.window(handle)
+            # assigning the location returns right away, unlike WebDriver.get which waits for the page to load
+            self.web_driver.execute_script(
+                f"document.documentElement.dataset.{self.STALE_MARKER} = '1'; window.location.href = arguments[0];",
+                url,
+            )
+        except WebDriverException:
+            # the page timeout deals with a tab that could not navigate
+            pass
+
+    def _is_loaded(self, handle: str) -> bool:
+        try:
+            self.web_driver.switch_to.window(handle)
+            return self.web_driver.execute_script(
+                f"return document.readyState === 'complete'"
+                f" && document.documentElement.dataset.{self.STALE_MARKER} === undefined;"
+            )
+        except WebDriverException:
+            # the document may be unloaded while the script runs, or the tab may have crashed:
+            # the page timeout deals with the tabs that stay stuck
+            return False
+
+    def snapshot(
+        self, products: Iterable[Product]
+    ) -> Iterator[Tuple[Product, Optional[List[ProductPrice]], Optional[str]]]:
+        """
+        Reads the prices of the products, in the order their pages finish loading.
+        The pages of products without a known url are found through the search bar in the first tab beforehand.
+
+        Args:
+            products: The products to look into.
+
+        Yields:
+            Each product along with its prices, or the error raised when reading them.
+        """
+        main_handle = self.web_driver.current_window_handle
+        pending: Deque[Product] = deque()
+        for product in products:
+            if product.url != "":
+                pending.append(product)
+                continue
+            try:
+                yield product, self.scraper.snapshot_product(product), None
+            except Exception:
+                yield product, None, traceback.format_exc()
+
+        handles = [main_handle]
+        for _ in range(min(self.n_tabs, len(pending)) - 1):
+            self.web_driver.switch_to.new_window("tab")
+            handles.append(self.web_driver.current_window_handle)
+        self.statistics = {handle: TabStatistics() for handle in handles}
+
+        in_flight: Dict[str, Tuple[Product, float]] = {}
+        idle_handles: Deque[str] = deque(handles)
+
+        def start_navigations() -> None:
+            while (
+                pending and idle_handles and len(in_flight) < self._limit(len(handles))
+            ):
+                handle, next_product = idle_handles.popleft(), pending.popleft()
+                self._start_navigation(handle, next_product.url)
+                in_flight[handle] = (next_product, time.perf_counter())
+
+        try:
+            start_navigations()
+            while in_flight:
+                ready = None
+                for handle, (product, started) in in_flight.items():
+                    if (
+                        self._is_loaded(handle)
+                        or time.perf_counter() - started > self.page_timeout
+                    ):
+                        ready = handle
+                        break
+                if ready is None:
+                    time.sleep(self.poll_interval)
+                    continue
+
+                product, started = in_flight.pop(ready)
+                statistics = self.statistics[ready]
+                loaded = time.perf_counter()
+                statistics.loading_time += loaded - started
+                statistics.n_pages += 1
+                prices, error, outcome = (
+                    None,
+                    None,
+                    AdaptiveConcurrencyController.SUCCESS,
+                )
+                try:
+                    if loaded - started > self.page_timeout:
+                        outcome = AdaptiveConcurrencyController.TIMEOUT
+                        self.web_driver.execute_script("window.stop();")
+                        raise TimeoutException(
+                            f"Page not loaded after {self.page_timeout} s."
+                        )
+                    if self.scraper.is_blocked_page():
+                        outcome = AdaptiveConcurrencyController.BLOCKED
+                        raise BlockedPageException(product.url)
+                    self.scraper.deal_with_cookie_modal()
+                    prices = self.scraper.read_snapshot_prices(product)
+                except Exception:
+                    if outcome == AdaptiveConcurrencyController.SUCCESS:
+                        outcome = AdaptiveConcurrencyController.ERROR
+                    statistics.n_errors += 1
+                    error = traceback.format_exc()
+                statistics.extraction_time += time.perf_counter() - loaded
+                if self.controller is not None:
+                    self.controller.record(loaded - started, outcome, len(in_flight))
+
+                # the tab moves on to the next product before the results are handed over
+                idle_handles.append(ready)
+                start_navigations()
+                yield product, prices, error
+        finally:
+            for handle in handles[1:]:
+                self.web_driver.switch_to.window(handle)
+                self.web_driver.close()
+            self.web_driver.switch_to.window(main_handle)
+
+    def print_statistics(self) -> None:
+        for index, statistics in enumerate(self.statistics.values()):
+            print(f"Tab {index}: {statistics}")
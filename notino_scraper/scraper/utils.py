@@ -1,5 +1,8 @@
 import nltk
 import re
+from typing import Optional
+
+from notino_scraper.data_structures.normalization import PRICE_PATTERN, price_to_float
 
 
 def format_info(fetched_info: str) -> str:
@@ -10,6 +13,36 @@ def get_volume_from_content(html_content: str) -> int:
     return int(re.sub(r"\s?ml", "", format_info(html_content).lower()))
 
 
+def find_price_in_content(text_content: str) -> Optional[float]:
+    """
+    Finds the first price displayed in a piece of text, e.g. "26,00 €" or "1 250,50 €".
+
+    Args:
+        text_content: The text to look into.
+
+    Returns:
+        The price as a float, None if no price is displayed.
+    """
+    match = re.search(PRICE_PATTERN, format_info(text_content))
+    if match is None:
+        return None
+    return price_to_float(match.group(0))
+
+
+def find_volume_in_content(text_content: str) -> int:
+    """
+    Finds the first volume in mL displayed in a piece of text, e.g. "Eau de Parfum 100 ml".
+
+    Args:
+        text_content: The text to look into.
+
+    Returns:
+        The volume in mL, 0 if no volume is displayed.
+    """
+    match = re.search(r"(\d+)\s?ml\b", format_info(text_content).lower())
+    return int(match.group(1)) if match is not None else 0
+
+
 def result_match(
     first_string: str, second_string: str, threshold: float = 0.20
 ) -> bool: